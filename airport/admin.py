@@ -7,6 +7,7 @@ from airport.models import (
     AirplaneType,
     Order,
     Route,
+    SeatHold,
     Ticket,
     Flight
 )
@@ -20,3 +21,4 @@ admin.site.register(Order)
 admin.site.register(Route)
 admin.site.register(Ticket)
 admin.site.register(Flight)
+admin.site.register(SeatHold)
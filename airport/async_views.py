@@ -0,0 +1,183 @@
+import base64
+import binascii
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db.models import aprefetch_related_objects
+from django.http import JsonResponse
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException, NotFound, Throttled
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from airport.filters import filter_flights
+from airport.instrumentation import measure_serialization
+from airport.models import Flight
+from airport.replicas import read_from_replica
+from airport.seatmap import SeatMap
+from airport.serializers import FlightDetailSerializer, FlightListSerializer
+from airport.views import FlightViewSet
+
+ASYNC_PAGE_SIZE = 5
+ASYNC_MAX_PAGE_SIZE = 100
+
+
+async def authenticate(request):
+    """Resolve the JWT user with the async ORM, or return ``None``."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except (APIException, KeyError):
+        return None
+
+    return await get_user_model().objects.filter(
+        **{jwt_settings.USER_ID_FIELD: user_id}, is_active=True
+    ).afirst()
+
+
+def error_response(exc):
+    response = JsonResponse(
+        exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail},
+        status=exc.status_code,
+    )
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = str(exc.wait)
+    return response
+
+
+async def check_throttles(request, user):
+    """Apply the throttles of ``FlightViewSet`` (``flight_search`` scope).
+
+    Raises ``Throttled`` like ``APIView.check_throttles``.
+    """
+    request.user = user
+    waits = []
+    for throttle_class in FlightViewSet.throttle_classes:
+        throttle = throttle_class()
+        if not await sync_to_async(throttle.allow_request)(
+            request, FlightViewSet
+        ):
+            waits.append(throttle.wait())
+    if waits:
+        raise Throttled(max(
+            (wait for wait in waits if wait is not None), default=None
+        ))
+
+
+def page_size(request):
+    try:
+        limit = min(
+            int(request.GET.get("limit", ASYNC_PAGE_SIZE)),
+            ASYNC_MAX_PAGE_SIZE,
+        )
+    except ValueError:
+        limit = ASYNC_PAGE_SIZE
+    return max(limit, 1)
+
+
+def encode_cursor(flight):
+    position = f"{flight.departure_time.isoformat()}|{flight.id}"
+    return base64.urlsafe_b64encode(position.encode()).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """``(departure_time, id)`` of the last flight of the previous page."""
+    try:
+        departure_time, flight_id = base64.urlsafe_b64decode(
+            cursor.encode("ascii")
+        ).decode().split("|")
+        departure_time = parse_datetime(departure_time)
+        flight_id = int(flight_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        departure_time = None
+    if departure_time is None:
+        raise NotFound("Invalid cursor")
+    return departure_time, flight_id
+
+
+@require_GET
+async def flight_list(request):
+    """Async flight search, same filters and rows as ``FlightViewSet``.
+
+    Pages follow ``(departure_time, id)`` like ``FlightPagination``: the
+    ``next`` link carries the position of the last flight, so a page
+    costs the same at any depth.
+    """
+    with read_from_replica():
+        return await _flight_list(request)
+
+
+async def _flight_list(request):
+    user = await authenticate(request)
+    if user is None:
+        return JsonResponse({"detail": "Not authenticated."}, status=401)
+
+    try:
+        await check_throttles(request, user)
+        queryset = filter_flights(Flight.objects.for_listing(), request.GET)
+        if request.GET.get("cursor"):
+            departure_time, flight_id = decode_cursor(request.GET["cursor"])
+            queryset = queryset.filter(
+                departure_time__gte=departure_time
+            ).exclude(departure_time=departure_time, id__lte=flight_id)
+    except APIException as exc:
+        return error_response(exc)
+
+    limit = page_size(request)
+    queryset = queryset.order_by("departure_time", "id")
+    flights = [flight async for flight in queryset[:limit + 1]]
+
+    next_url = None
+    if len(flights) > limit:
+        query = request.GET.copy()
+        query["limit"] = limit
+        query["cursor"] = encode_cursor(flights[limit - 1])
+        next_url = request.build_absolute_uri(
+            f"{request.path}?{query.urlencode()}"
+        )
+
+    with measure_serialization():
+        results = FlightListSerializer(flights[:limit], many=True).data
+    return JsonResponse({"next": next_url, "results": results})
+
+
+@require_GET
+async def flight_detail(request, pk):
+    """Async flight detail with seat map (``?seatmap=bitmap`` supported)."""
+    with read_from_replica():
+        return await _flight_detail(request, pk)
+
+
+async def _flight_detail(request, pk):
+    user = await authenticate(request)
+    if user is None:
+        return JsonResponse({"detail": "Not authenticated."}, status=401)
+    try:
+        await check_throttles(request, user)
+    except Throttled as exc:
+        return error_response(exc)
+
+    flight = await Flight.objects.select_related(
+        "route__source",
+        "route__destination",
+        "airplane__airplane_type",
+    ).filter(pk=pk).afirst()
+    if flight is None:
+        return JsonResponse({"detail": "No Flight matches the given query."},
+                            status=404)
+
+    await aprefetch_related_objects([flight], "crew")
+    serializer = FlightDetailSerializer(flight, context={
+        "request": request,
+        "seatmap": request.GET.get("seatmap"),
+        "seat_map": await SeatMap.afor_flight(flight),
+    })
+    with measure_serialization():
+        data = serializer.data
+    return JsonResponse(data)
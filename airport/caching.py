@@ -0,0 +1,66 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from airport.generations import bump_generation, current_generation
+from airport.replicas import read_from_primary
+
+FLIGHT_SEARCH_GENERATION_KEY = "flight-search:generation"
+
+
+def flight_search_cache():
+    return caches[settings.FLIGHT_SEARCH_CACHE["ALIAS"]]
+
+
+def flight_search_generation():
+    return current_generation(
+        flight_search_cache(), FLIGHT_SEARCH_GENERATION_KEY
+    ) or ""
+
+
+def invalidate_flight_search():
+    """Drop every cached flight search."""
+    bump_generation(flight_search_cache(), FLIGHT_SEARCH_GENERATION_KEY)
+
+
+def flight_search_cache_key(request):
+    params = sorted(
+        (key, value.strip())
+        for key, values in request.query_params.lists()
+        for value in values
+        if value.strip()
+    )
+    raw_key = "|".join([
+        flight_search_generation(),
+        request.get_host(),
+        request.path,
+        repr(params),
+    ])
+    return "flight-search:" + hashlib.sha1(raw_key.encode()).hexdigest()
+
+
+class CachedListMixin:
+    """Serve the ``list`` action from the flight search cache.
+
+    Misses are loaded from the primary, a replica could still return the
+    rows of the previous generation.
+    """
+
+    def list(self, request, *args, **kwargs):
+        timeout = settings.FLIGHT_SEARCH_CACHE["TIMEOUT"]
+        if not timeout:
+            return super().list(request, *args, **kwargs)
+
+        cache = flight_search_cache()
+        key = flight_search_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        with read_from_primary():
+            response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout)
+        return response
@@ -0,0 +1,155 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.db.models import Count, Max, Value
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from airport.generations import bump_generation, new_generation
+from airport.replicas import read_from_primary
+
+
+def table_marker_cache():
+    return caches[settings.CATALOG_MARKER_CACHE["ALIAS"]]
+
+
+def table_marker_key(model):
+    return f"catalog-marker:{model._meta.label_lower}"
+
+
+def table_touched_key(model):
+    return f"catalog-marker:{model._meta.label_lower}:touched"
+
+
+def _rebuild_markers(models, touched):
+    """Markers from the row count and ``max(updated_at)``, in one query.
+
+    The last modified time is at least the table's last ``touched`` time,
+    as a delete leaves no newer row behind.
+    """
+    queries = [
+        model.objects.using(router.db_for_write(model)).order_by().values(
+            label=Value(model._meta.label_lower)
+        ).annotate(
+            count=Count("id"), modified=Max("updated_at")
+        ).values_list("label", "count", "modified")
+        for model in models
+    ]
+    stats = queries[0].union(*queries[1:], all=True)
+    markers = {}
+    for label, count, modified in stats:
+        modified = max(
+            int(modified.timestamp()) if modified else 0,
+            touched.get(label) or 0,
+        ) or None
+        markers[label] = (f"{count}-{modified}", modified)
+    return markers
+
+
+def table_markers(models):
+    """``(version, last modified timestamp)`` of every model's table.
+
+    Markers are written on save/delete; missing ones are rebuilt from the
+    row count and ``max(updated_at)`` on the primary, and the time of the
+    last save/delete, which is kept without expiry. They expire after
+    ``CATALOG_MARKER_CACHE["TIMEOUT"]``, so a change that skipped the
+    signals (or a cache the other workers do not share) is picked up
+    within that time.
+    """
+    cache = table_marker_cache()
+    keys = {model: table_marker_key(model) for model in models}
+    markers = cache.get_many(keys.values())
+
+    missing = [model for model, key in keys.items() if key not in markers]
+    if missing:
+        touched_keys = {
+            model._meta.label_lower: table_touched_key(model)
+            for model in missing
+        }
+        touched = cache.get_many(touched_keys.values())
+        rebuilt = _rebuild_markers(missing, {
+            label: touched.get(key) for label, key in touched_keys.items()
+        })
+        for model in missing:
+            key = keys[model]
+            markers[key] = rebuilt[model._meta.label_lower]
+            cache.add(
+                key, markers[key], settings.CATALOG_MARKER_CACHE["TIMEOUT"]
+            )
+    return [markers[key] for key in keys.values()]
+
+
+def _touch(model):
+    """Now, kept without expiry as the table's last change.
+
+    Never earlier than the stored time, so Last-Modified does not go back
+    when the marker expires or a worker's clock is behind.
+    """
+    cache = table_marker_cache()
+    key = table_touched_key(model)
+    touched = max(int(timezone.now().timestamp()), cache.get(key) or 0)
+    cache.set(key, touched, None)
+    return touched
+
+
+def touch_table(model):
+    """Change the table's marker, now and once more on commit."""
+    bump_generation(
+        table_marker_cache(),
+        table_marker_key(model),
+        settings.CATALOG_MARKER_CACHE["TIMEOUT"],
+        new=lambda: (new_generation(), _touch(model)),
+    )
+
+
+class ConditionalGetMixin:
+    """Answer ``list``/``retrieve`` with ETag and Last-Modified.
+
+    Both come from the change markers of ``conditional_models``, every
+    table the response is built from, so a 304 is sent without loading
+    or serializing any rows.
+    """
+
+    conditional_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_validators(self, request):
+        markers = table_markers(self.conditional_models)
+        raw_etag = "|".join([
+            *(version for version, _ in markers),
+            request.get_full_path(),
+            request.accepted_renderer.format,
+        ])
+        etag = f'"{hashlib.sha1(raw_etag.encode()).hexdigest()}"'
+        last_modified = max(
+            (modified for _, modified in markers if modified), default=None
+        )
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            # The body has to match the markers, which a replica may
+            # not have caught up with yet.
+            with read_from_primary():
+                response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
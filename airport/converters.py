@@ -0,0 +1,183 @@
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import ForeignKey
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601, Field
+from rest_framework.relations import PKOnlyObject
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from airport.instrumentation import measure_serialization
+from airport.renderers import FastJSONRenderer
+
+# Fields whose ``to_representation`` is a plain type conversion.
+CONVERSIONS = {
+    serializers.IntegerField: int,
+    serializers.CharField: str,
+    serializers.BooleanField: bool,
+}
+
+
+def _model_field(serializer, field):
+    """The model field ``field`` reads as a plain attribute, if any."""
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    if model is None or len(field.source_attrs) != 1:
+        return None
+    try:
+        return model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+
+
+def _datetime_conversion(field):
+    """``DateTimeField`` with its timezone and format resolved once."""
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    field_timezone = (
+        field.timezone if hasattr(field, "timezone")
+        else field.default_timezone()
+    )
+    if (
+        field_timezone is None
+        or output_format is None
+        or output_format.lower() == ISO_8601
+    ):
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or value.utcoffset() is None:
+            return field.to_representation(value)
+        return value.astimezone(field_timezone).strftime(output_format)
+    return convert
+
+
+def _conversion(field):
+    to_representation = type(field).to_representation
+    if to_representation is serializers.DateTimeField.to_representation:
+        return _datetime_conversion(field)
+    for field_class, conversion in CONVERSIONS.items():
+        if to_representation is field_class.to_representation:
+            return conversion
+    return field.to_representation
+
+
+def _field_converter(serializer, field):
+    """``instance -> value`` with the result of DRF's field dispatch."""
+    model_field = _model_field(serializer, field)
+
+    if isinstance(field, serializers.ListSerializer) and model_field:
+        convert_item = row_converter(field.child)
+        get_related = attrgetter(field.source)
+
+        def convert(instance):
+            items = get_related(instance)
+            if isinstance(items, BaseManager):
+                items = items.all()
+            return [convert_item(item) for item in items]
+        return convert
+
+    if isinstance(field, serializers.Serializer) and model_field:
+        return _none_or(attrgetter(field.source), row_converter(field))
+
+    if (
+        type(field) is serializers.PrimaryKeyRelatedField
+        and field.pk_field is None
+        and isinstance(model_field, ForeignKey)
+    ):
+        return attrgetter(model_field.attname)
+
+    if (
+        type(field).get_attribute is Field.get_attribute
+        and model_field is not None
+        and model_field.concrete
+        and not model_field.is_relation
+    ):
+        return _none_or(attrgetter(field.source), _conversion(field))
+
+    if isinstance(field, serializers.RelatedField):
+        return _related_converter(field)
+
+    return _none_or(field.get_attribute, _conversion(field))
+
+
+def _none_or(get_attribute, to_representation):
+    def convert(instance):
+        attribute = get_attribute(instance)
+        return None if attribute is None else to_representation(attribute)
+    return convert
+
+
+def _related_converter(field):
+    """``Serializer.to_representation``'s step for a related field."""
+    def convert(instance):
+        attribute = field.get_attribute(instance)
+        check_for_none = (
+            attribute.pk if isinstance(attribute, PKOnlyObject)
+            else attribute
+        )
+        if check_for_none is None:
+            return None
+        return field.to_representation(attribute)
+    return convert
+
+
+def row_converter(serializer):
+    """Compile ``serializer``'s readable fields to one ``row -> dict``.
+
+    Plain model attributes are read with ``attrgetter`` and converted with
+    ``int``/``str``/``bool`` where the field does no more than that; nested
+    serializers are compiled the same way. Other fields keep their own
+    ``get_attribute``/``to_representation``. Fields that raise
+    ``SkipField`` (write-only defaults) are not supported.
+    """
+    converters = tuple(
+        (field.field_name, _field_converter(serializer, field))
+        for field in serializer._readable_fields
+    )
+
+    def convert(row):
+        return {name: convert_field(row) for name, convert_field in converters}
+    return convert
+
+
+class FastListMixin:
+    """Serve ``list`` through a compiled row converter and orjson.
+
+    Opt-in with ``FAST_LIST_RENDERING``: the list serializer only provides
+    the field declarations, rows are converted by ``row_converter()`` and
+    JSON is encoded by ``FastJSONRenderer``. The output is the same.
+    """
+
+    @property
+    def fast_list_rendering(self):
+        return (
+            settings.FAST_LIST_RENDERING
+            and getattr(self, "action", None) == "list"
+        )
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if not self.fast_list_rendering:
+            return renderers
+        return [
+            FastJSONRenderer() if type(renderer) is JSONRenderer
+            else renderer
+            for renderer in renderers
+        ]
+
+    def list(self, request, *args, **kwargs):
+        if not self.fast_list_rendering:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        convert = row_converter(self.get_serializer())
+        rows = queryset if page is None else page
+        with measure_serialization():
+            data = [convert(row) for row in rows]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
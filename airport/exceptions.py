@@ -0,0 +1,8 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SeatConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The seat is already sold or held by another user."
+    default_code = "seat_conflict"
@@ -0,0 +1,84 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+
+EXPORT_CHUNK_SIZE = 2000
+
+FLIGHT_EXPORT_FIELDS = {
+    "id": "id",
+    "route": "route_id",
+    "source_city": "route__source__closest_big_city",
+    "destination_city": "route__destination__closest_big_city",
+    "airplane": "airplane__name",
+    "departure_time": "departure_time",
+    "arrival_time": "arrival_time",
+    "tickets_available": "tickets_available",
+}
+
+TICKET_EXPORT_FIELDS = {
+    "id": "id",
+    "order": "order_id",
+    "order_created_at": "order__created_at",
+    "user": "order__user__email",
+    "flight": "flight_id",
+    "departure_time": "flight__departure_time",
+    "row": "row",
+    "seat": "seat",
+}
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _ndjson_lines(rows, columns):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+def _csv_lines(rows, columns):
+    writer = csv.writer(_Echo())
+    encoder = DjangoJSONEncoder()
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(
+            value if isinstance(value, (str, int)) else encoder.default(value)
+            for value in row
+        )
+
+
+EXPORT_FORMATS = {
+    "ndjson": (_ndjson_lines, "application/x-ndjson"),
+    "csv": (_csv_lines, "text/csv"),
+}
+
+
+def export_response(queryset, fields, output, filename):
+    """Stream ``queryset`` rows as NDJSON or CSV.
+
+    Rows are read with a server-side cursor in chunks of
+    ``EXPORT_CHUNK_SIZE``, so memory use does not grow with the result.
+    The database is picked here, while the view's ``read_from_replica()``
+    block is still open, since the rows are only read once the response
+    is streamed.
+    """
+    if output not in EXPORT_FORMATS:
+        raise ValidationError(
+            {"output": f"Expected one of: {', '.join(EXPORT_FORMATS)}"}
+        )
+    write_lines, content_type = EXPORT_FORMATS[output]
+    rows = queryset.using(queryset.db).values_list(
+        *fields.values()
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    response = StreamingHttpResponse(
+        write_lines(rows, list(fields)), content_type=content_type
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{output}"'
+    )
+    return response
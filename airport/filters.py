@@ -0,0 +1,161 @@
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.dateparse import parse_date
+from django.utils.timezone import make_aware
+from rest_framework.exceptions import ValidationError
+
+
+def lookup_spans_to_many(model, lookup):
+    """Return True if ``lookup`` joins over a to-many relation of ``model``.
+
+    Such joins can return a row more than once, so only then the
+    filtered queryset needs ``distinct()``.
+    """
+    opts = model._meta
+    for part in lookup.split(LOOKUP_SEP):
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            return False
+        if field.many_to_many or field.one_to_many:
+            return True
+        if not field.is_relation:
+            return False
+        opts = field.related_model._meta
+    return False
+
+
+def filter_queryset(queryset, **lookups):
+    queryset = queryset.filter(**lookups)
+    if any(
+        lookup_spans_to_many(queryset.model, lookup) for lookup in lookups
+    ):
+        queryset = queryset.distinct()
+    return queryset
+
+
+def params_to_ints(query_string, param_name):
+    try:
+        return [int(str_id) for str_id in query_string.split(",")]
+    except ValueError:
+        raise ValidationError(
+            {param_name: "Expected comma-separated ids (ex. 1,2)"}
+        )
+
+
+def param_to_int(query_string, param_name, minimum=1, maximum=None):
+    try:
+        value = int(query_string)
+    except (TypeError, ValueError):
+        value = None
+    if (
+        value is None
+        or value < minimum
+        or (maximum is not None and value > maximum)
+    ):
+        expected = f"an integer from {minimum}"
+        if maximum is not None:
+            expected += f" to {maximum}"
+        raise ValidationError({param_name: f"Expected {expected}"})
+    return value
+
+
+def param_to_datetime(query_string, param_name, days=0):
+    try:
+        day = parse_date(query_string)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError(
+            {param_name: "Expected date in YYYY-MM-DD format"}
+        )
+    return make_aware(
+        datetime.combine(day + timedelta(days=days), time.min)
+    )
+
+
+def filter_flights(queryset, params):
+    """Apply the flight search query params to a ``Flight`` queryset."""
+    departure_time = params.get("departure_time")
+    source = params.get("route_source")
+    destination = params.get("route_destination")
+
+    if params.get("source"):
+        queryset = filter_queryset(
+            queryset,
+            route__source_id__in=params_to_ints(
+                params["source"], "source"
+            )
+        )
+    if params.get("destination"):
+        queryset = filter_queryset(
+            queryset,
+            route__destination_id__in=params_to_ints(
+                params["destination"], "destination"
+            )
+        )
+    if params.get("source_city"):
+        queryset = filter_queryset(
+            queryset,
+            route__source__closest_big_city__startswith=params[
+                "source_city"
+            ]
+        )
+    if params.get("destination_city"):
+        queryset = filter_queryset(
+            queryset,
+            route__destination__closest_big_city__startswith=params[
+                "destination_city"
+            ]
+        )
+    if params.get("departure_date_from"):
+        queryset = filter_queryset(
+            queryset,
+            departure_time__gte=param_to_datetime(
+                params["departure_date_from"], "departure_date_from"
+            )
+        )
+    if params.get("departure_date_to"):
+        queryset = filter_queryset(
+            queryset,
+            departure_time__lt=param_to_datetime(
+                params["departure_date_to"], "departure_date_to", days=1
+            )
+        )
+
+    if departure_time:
+        queryset = filter_queryset(
+            queryset,
+            departure_time__icontains=departure_time
+        )
+    if source:
+        queryset = filter_queryset(
+            queryset,
+            route__source__closest_big_city__icontains=source
+        )
+    if destination:
+        queryset = filter_queryset(
+            queryset,
+            route__destination__closest_big_city__icontains=destination
+        )
+
+    return queryset
+
+
+def filter_orders(queryset, params):
+    """Apply the order history date range params to an ``Order`` queryset."""
+    if params.get("created_date_from"):
+        queryset = queryset.filter(
+            created_at__gte=param_to_datetime(
+                params["created_date_from"], "created_date_from"
+            )
+        )
+    if params.get("created_date_to"):
+        queryset = queryset.filter(
+            created_at__lt=param_to_datetime(
+                params["created_date_to"], "created_date_to", days=1
+            )
+        )
+    return queryset
@@ -0,0 +1,42 @@
+"""Generation keys in a shared cache.
+
+A generation is a value stored under one cache key that readers fold into
+their own cache keys, or compare with what they loaded, and writers
+replace to invalidate everything derived from it. It is shared by the
+flight search cache, the per-token user cache, the catalog change
+markers, the route graph journal and the reference data snapshots.
+"""
+import uuid
+
+from django.db import transaction
+
+
+def new_generation():
+    return uuid.uuid4().hex
+
+
+def current_generation(cache, key, timeout=None, new=new_generation):
+    """The generation under ``key``, started with ``new()`` if missing.
+
+    Concurrent starts agree on one value through ``cache.add``. ``None``
+    is returned only if the cache does not keep it at all.
+    """
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, new(), timeout)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(cache, key, timeout=None, new=new_generation):
+    """Replace the generation right away and once more on commit.
+
+    The second bump keeps a request that ran between the write and the
+    commit, and still saw the old rows, from leaving them cached under
+    the new generation.
+    """
+    def bump():
+        cache.set(key, new(), timeout)
+
+    bump()
+    transaction.on_commit(bump)
@@ -0,0 +1,469 @@
+import contextvars
+import hashlib
+import hmac
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger("airport.requests")
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Histogram sums are shared as integer counters of microseconds.
+SUM_UNITS = 1_000_000
+SERIES_KEY = "metrics:series"
+
+_current_request = contextvars.ContextVar("request_metrics", default=None)
+_http_request = contextvars.ContextVar("http_request", default=None)
+
+
+class RequestMetrics:
+    __slots__ = (
+        "started",
+        "view_started",
+        "view_time",
+        "serializing",
+        "serialize_time",
+        "render_started",
+        "render_time",
+        "queries",
+        "db_time",
+    )
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_time = 0.0
+        self.serializing = False
+        self.serialize_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+
+    def rendered(self, response):
+        self.render_time = time.perf_counter() - self.render_started
+
+
+def record_query(execute, sql, params, many, context):
+    """``execute_wrapper`` counting queries of the sampled request."""
+    metrics = _current_request.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - started
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def measure_serialization():
+    """Add the block's time to the sampled request's serializer time.
+
+    Nested blocks (a serializer building another one) count once.
+    """
+    metrics = _current_request.get()
+    if metrics is None or metrics.serializing:
+        yield
+        return
+
+    metrics.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_time += time.perf_counter() - started
+        metrics.serializing = False
+
+
+class SerializerTimingMixin:
+    """Count ``serializer.data`` of the view's serializers as serializer time.
+
+    Serializers from ``get_serializer()`` run ``to_representation()``
+    inside ``measure_serialization()`` while the request is sampled;
+    nested serializers are covered by the outer one.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if _current_request.get() is None:
+            return serializer
+
+        to_representation = serializer.to_representation
+
+        def measured_representation(instance):
+            with measure_serialization():
+                return to_representation(instance)
+
+        serializer.to_representation = measured_representation
+        return serializer
+
+
+def _format_labels(labels):
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", r"\\").replace('"', r"\"")
+            .replace("\n", r"\n"),
+        )
+        for name, value in labels
+    )
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        # Bucket counts, then the count and the sum in SUM_UNITS.
+        self.size = len(buckets) + 2
+        self.series = defaultdict(lambda: [0] * self.size)
+
+    def observe(self, labels, value):
+        counts = self.series[labels]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        counts[-2] += 1
+        counts[-1] += round(value * SUM_UNITS)
+
+    def render(self, series):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, counts in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket_labels = _format_labels(labels + (("le", bound),))
+                yield f"{self.name}_bucket{{{bucket_labels}}} {cumulative}"
+            formatted = _format_labels(labels)
+            inf_labels = _format_labels(labels + (("le", "+Inf"),))
+            yield f"{self.name}_bucket{{{inf_labels}}} {counts[-2]}"
+            yield f"{self.name}_sum{{{formatted}}} {counts[-1] / SUM_UNITS}"
+            yield f"{self.name}_count{{{formatted}}} {counts[-2]}"
+
+
+class Counter:
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self.size = 1
+        self.series = defaultdict(lambda: [0])
+
+    def inc(self, labels):
+        self.series[labels][0] += 1
+
+    def render(self, series):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, (count,) in sorted(series.items()):
+            yield f"{self.name}{{{_format_labels(labels)}}} {count}"
+
+
+class MetricsRegistry:
+    """Request metrics summed over all workers in ``REQUEST_METRICS_CACHE``.
+
+    Each worker buffers its observations and adds them to integer
+    counters in the shared cache with ``incr`` at most every
+    ``FLUSH_INTERVAL`` seconds and before rendering ``/metrics``, so
+    whichever worker serves ``/metrics`` reports the totals. The series
+    are listed under ``SERIES_KEY``; a worker whose update of that list
+    was lost to a concurrent one adds its series again on its next flush.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = Counter(
+            "airport_requests_total", "Requests by view and status."
+        )
+        self.duration = Histogram(
+            "airport_request_duration_seconds",
+            "Total request latency.",
+            DURATION_BUCKETS,
+        )
+        self.db_duration = Histogram(
+            "airport_request_db_duration_seconds",
+            "Time spent in database queries per request.",
+            DURATION_BUCKETS,
+        )
+        self.serialize_duration = Histogram(
+            "airport_request_serialize_duration_seconds",
+            "Time spent in serializers (and the queries they run).",
+            DURATION_BUCKETS,
+        )
+        self.render_duration = Histogram(
+            "airport_request_render_duration_seconds",
+            "Time spent encoding the response body.",
+            DURATION_BUCKETS,
+        )
+        self.queries = Histogram(
+            "airport_request_db_queries",
+            "Database queries per request.",
+            QUERY_BUCKETS,
+        )
+        self.metrics = {
+            metric.name: metric
+            for metric in (
+                self.requests,
+                self.duration,
+                self.db_duration,
+                self.serialize_duration,
+                self.render_duration,
+                self.queries,
+            )
+        }
+        self.published = frozenset()
+        self.flushed_at = time.monotonic()
+
+    @property
+    def cache(self):
+        return caches[settings.REQUEST_METRICS_CACHE["ALIAS"]]
+
+    def keys(self, name, labels):
+        digest = hashlib.sha1(repr(labels).encode()).hexdigest()[:16]
+        return [
+            f"metrics:{name}:{digest}:{index}"
+            for index in range(self.metrics[name].size)
+        ]
+
+    def reset(self):
+        """Drop the buffered and the shared metrics."""
+        with self.lock:
+            for metric in self.metrics.values():
+                metric.series.clear()
+            self.published = frozenset()
+        series = self.cache.get(SERIES_KEY, set())
+        self.cache.delete_many([SERIES_KEY] + [
+            key for name, labels in series for key in self.keys(name, labels)
+        ])
+
+    def count(self, view, method, status):
+        with self.lock:
+            self.requests.inc(
+                (("view", view), ("method", method), ("status", status))
+            )
+
+    def observe(self, view, method, metrics, duration):
+        labels = (("view", view), ("method", method))
+        with self.lock:
+            self.duration.observe(labels, duration)
+            self.db_duration.observe(labels, metrics.db_time)
+            self.serialize_duration.observe(labels, metrics.serialize_time)
+            self.render_duration.observe(labels, metrics.render_time)
+            self.queries.observe(labels, metrics.queries)
+
+    def flush(self, force=False):
+        """Add the buffered observations to the shared counters."""
+        interval = settings.REQUEST_METRICS_CACHE["FLUSH_INTERVAL"]
+        with self.lock:
+            now = time.monotonic()
+            if not force and now - self.flushed_at < interval:
+                return
+            self.flushed_at = now
+            pending = [
+                (name, labels, counts)
+                for name, metric in self.metrics.items()
+                for labels, counts in metric.series.items()
+            ]
+            for metric in self.metrics.values():
+                metric.series.clear()
+            self.published = published = self.published.union(
+                (name, labels) for name, labels, _ in pending
+            )
+
+        cache = self.cache
+        for name, labels, counts in pending:
+            for key, delta in zip(self.keys(name, labels), counts):
+                if not delta:
+                    continue
+                cache.add(key, 0, None)
+                try:
+                    cache.incr(key, delta)
+                except ValueError:
+                    cache.set(key, delta, None)
+
+        series = cache.get(SERIES_KEY, set())
+        if not published <= series:
+            cache.set(SERIES_KEY, series | published, None)
+
+    def render(self):
+        self.flush(force=True)
+        series = sorted(self.cache.get(SERIES_KEY, set()))
+        keys = {
+            (name, labels): self.keys(name, labels)
+            for name, labels in series
+        }
+        values = self.cache.get_many(
+            [key for series_keys in keys.values() for key in series_keys]
+        )
+        return "\n".join(
+            line
+            for name, metric in self.metrics.items()
+            for line in metric.render({
+                labels: [values.get(key, 0) for key in series_keys]
+                for (series_name, labels), series_keys in keys.items()
+                if series_name == name
+            })
+        ) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def view_name(request):
+    """``FlightViewSet.list`` for viewsets, the function name otherwise."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+
+    view_class = getattr(match.func, "cls", None)
+    if view_class is None:
+        return match.func.__name__
+    action = getattr(match.func, "actions", {}).get(
+        request.method.lower(), request.method.lower()
+    )
+    return f"{view_class.__name__}.{action}"
+
+
+def current_view():
+    """Name of the view handling the current request, if any."""
+    request = _http_request.get()
+    return None if request is None else view_name(request)
+
+
+class RequestMetricsMiddleware:
+    """Record latency, DB time and query count per request.
+
+    Every request is counted; only a ``REQUEST_METRICS["SAMPLE_RATE"]``
+    share of them gets timed, logged to ``airport.requests`` and added to
+    the histograms served at ``/metrics``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_METRICS["SAMPLE_RATE"]
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics, tokens = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop(tokens)
+        self.finish(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics, tokens = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.stop(tokens)
+        self.finish(request, response, metrics)
+        return response
+
+    def start(self, request):
+        tokens = [(_http_request, _http_request.set(request))]
+        if random.random() >= self.sample_rate:
+            return None, tokens
+        metrics = RequestMetrics()
+        tokens.append((_current_request, _current_request.set(metrics)))
+        return metrics, tokens
+
+    @staticmethod
+    def stop(tokens):
+        for context_var, token in reversed(tokens):
+            context_var.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current_request.get()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        metrics = _current_request.get()
+        if metrics is not None:
+            metrics.render_started = time.perf_counter()
+            if metrics.view_started is not None:
+                metrics.view_time = (
+                    metrics.render_started - metrics.view_started
+                )
+            response.add_post_render_callback(metrics.rendered)
+        return response
+
+    def finish(self, request, response, metrics):
+        view = view_name(request)
+        REGISTRY.count(view, request.method, response.status_code)
+        REGISTRY.flush()
+        if metrics is None:
+            return
+
+        finished = time.perf_counter()
+        duration = finished - metrics.started
+        if metrics.view_started is not None and not metrics.view_time:
+            metrics.view_time = finished - metrics.view_started
+        REGISTRY.observe(view, request.method, metrics, duration)
+        logger.info(json.dumps({
+            "view": view,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "view_ms": round(metrics.view_time * 1000, 2),
+            "db_queries": metrics.queries,
+            "db_ms": round(metrics.db_time * 1000, 2),
+            "serialize_ms": round(metrics.serialize_time * 1000, 2),
+            "render_ms": round(metrics.render_time * 1000, 2),
+        }))
+
+
+def metrics_view(request):
+    """Prometheus text exposition of the request metrics of all workers.
+
+    With ``METRICS_TOKEN`` set the token is required; without it the
+    endpoint is public only when ``REQUEST_METRICS["PUBLIC"]`` allows it
+    (outside production) and staff-only otherwise.
+    """
+    token = settings.REQUEST_METRICS["TOKEN"]
+    if token:
+        allowed = hmac.compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        )
+    else:
+        allowed = (
+            settings.REQUEST_METRICS["PUBLIC"] or request.user.is_staff
+        )
+    if not allowed:
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        REGISTRY.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
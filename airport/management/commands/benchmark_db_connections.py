@@ -0,0 +1,62 @@
+import time
+from statistics import mean, quantiles
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure per-request DB latency with a new connection per request "
+        "and with the configured connection persistence or pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        configured = connection.settings_dict.get("CONN_MAX_AGE", 0)
+        pooled = "pool" in connection.settings_dict.get("OPTIONS", {})
+
+        modes = [("new connection per request", 0)]
+        if pooled:
+            modes.append(("connection pool", 0))
+        else:
+            modes.append(("persistent connection", configured or None))
+
+        try:
+            for name, max_age in modes:
+                connection.close()
+                connection.settings_dict["CONN_MAX_AGE"] = max_age
+                self.report(name, self.measure(connection, options))
+        finally:
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = configured
+
+    @staticmethod
+    def measure(connection, options):
+        """Time requests that open/reuse a connection and run one query.
+
+        ``request_started``/``request_finished`` apply CONN_MAX_AGE and
+        the health checks exactly as in a real request cycle.
+        """
+        latencies = []
+        for _ in range(options["requests"]):
+            started = time.perf_counter()
+            request_started.send(sender=Command)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            request_finished.send(sender=Command)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    def report(self, name, latencies):
+        cuts = quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{name:>27}: mean {mean(latencies) * 1000:6.2f} ms, "
+            f"p50 {cuts[49] * 1000:6.2f} ms, p95 {cuts[94] * 1000:6.2f} ms"
+        )
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from statistics import quantiles
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import Flight
+from airport.views import FlightViewSet
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare the sync and async flight read endpoints under "
+        "concurrent load through the ASGI handler"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email", required=True, help="User to authenticate as"
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(email=options["email"]).first()
+        if user is None:
+            raise CommandError(f"No user with email {options['email']}")
+        flight = Flight.objects.order_by("id").first()
+        if flight is None:
+            raise CommandError("The benchmark needs at least one flight")
+        token = AccessToken.for_user(user)
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+        targets = [
+            ("sync list", reverse("airport:flight-list")),
+            ("async list", reverse("airport:flight-list-async")),
+            (
+                "sync detail",
+                reverse("airport:flight-detail", args=[flight.id]),
+            ),
+            (
+                "async detail",
+                reverse("airport:flight-detail-async", args=[flight.id]),
+            ),
+        ]
+
+        throttle_classes = FlightViewSet.throttle_classes
+        FlightViewSet.throttle_classes = ()
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=["testserver"],
+                FLIGHT_SEARCH_CACHE={"ALIAS": "default", "TIMEOUT": 0},
+            ):
+                for name, url in targets:
+                    self.report(name, async_to_sync(self.load)(url, options))
+        finally:
+            FlightViewSet.throttle_classes = throttle_classes
+
+    async def load(self, url, options):
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(options["concurrency"])
+        latencies = []
+        errors = 0
+
+        async def fetch():
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url, headers=self.headers)
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(options["requests"])))
+        return time.perf_counter() - started, latencies, errors
+
+    def report(self, name, result):
+        elapsed, latencies, errors = result
+        cuts = quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+        self.stdout.write(
+            f"{name:>12}: {len(latencies) / elapsed:8.1f} req/s, "
+            f"p50 {cuts[49] * 1000:7.1f} ms, p95 {cuts[94] * 1000:7.1f} ms, "
+            f"{errors} errors"
+        )
@@ -0,0 +1,137 @@
+import math
+import random
+import time
+from statistics import mean, quantiles
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport.route_graph import RouteGraph
+
+
+def synthetic_routes(airports, neighbours, seed):
+    """``(route_id, source, destination, distance)`` of a random network.
+
+    Airports are scattered over a 10000 km square and linked both ways to
+    some of their neighbours in longitude order, plus one long haul each.
+    """
+    generator = random.Random(seed)
+    positions = sorted(
+        (generator.uniform(0, 10000), generator.uniform(0, 10000))
+        for _ in range(airports)
+    )
+    pairs = set()
+    for source in range(airports):
+        nearby = range(max(0, source - 20), min(airports, source + 21))
+        destinations = generator.sample(
+            [airport for airport in nearby if airport != source],
+            min(neighbours, len(nearby) - 1),
+        )
+        destinations.append(generator.randrange(airports))
+        for destination in destinations:
+            if destination != source:
+                pairs.add((source, destination))
+                pairs.add((destination, source))
+    return [
+        (
+            route_id,
+            source,
+            destination,
+            max(1, round(
+                math.dist(positions[source], positions[destination])
+            )),
+        )
+        for route_id, (source, destination) in enumerate(sorted(pairs), 1)
+    ]
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure route graph build, incremental change, Dijkstra, A* and "
+        "k shortest path times on a synthetic network"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--airports", type=int, default=5000)
+        parser.add_argument("--neighbours", type=int, default=3)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--paths", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        if options["airports"] < 2:
+            raise CommandError("Use at least 2 airports")
+        routes = synthetic_routes(
+            options["airports"], options["neighbours"], options["seed"]
+        )
+
+        started = time.perf_counter()
+        graph = RouteGraph(version=0)
+        for route in routes:
+            graph.put_route(*route)
+        self.write_time("build", time.perf_counter() - started)
+        self.stdout.write(
+            f"{'network':>20}: {options['airports']} airports, "
+            f"{len(routes)} routes"
+        )
+
+        started = time.perf_counter()
+        graph.landmarks
+        self.write_time("landmarks", time.perf_counter() - started)
+
+        route_id, source, destination, distance = routes[0]
+        started = time.perf_counter()
+        graph.with_changes(
+            1, [(route_id, (source, destination, distance + 1))]
+        )
+        self.write_time("incremental change", time.perf_counter() - started)
+
+        generator = random.Random(options["seed"])
+        queries = [
+            tuple(generator.sample(range(options["airports"]), 2))
+            for _ in range(options["queries"])
+        ]
+        dijkstra = self.measure(
+            lambda query: graph.shortest_path(*query, use_landmarks=False),
+            queries,
+        )
+        a_star = self.measure(
+            lambda query: graph.shortest_path(*query), queries
+        )
+        k_shortest = self.measure(
+            lambda query: graph.k_shortest_paths(*query, options["paths"]),
+            queries[:max(1, len(queries) // 10)],
+        )
+
+        mismatches = sum(
+            (left and left[0]) != (right and right[0])
+            for left, right in zip(dijkstra[1], a_star[1])
+        )
+        self.report("dijkstra", dijkstra[0])
+        self.report("a* (landmarks)", a_star[0])
+        self.report(f"{options['paths']} shortest paths", k_shortest[0])
+        if mismatches:
+            raise CommandError(
+                f"A* and Dijkstra disagree on {mismatches} queries"
+            )
+
+    @staticmethod
+    def measure(search, queries):
+        latencies = []
+        results = []
+        for query in queries:
+            started = time.perf_counter()
+            results.append(search(query))
+            latencies.append(time.perf_counter() - started)
+        return latencies, results
+
+    def write_time(self, name, seconds):
+        self.stdout.write(f"{name:>20}: {seconds * 1000:8.2f} ms")
+
+    def report(self, name, latencies):
+        if len(latencies) < 2:
+            latencies = latencies * 2
+        cuts = quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{name:>20}: mean {mean(latencies) * 1000:6.2f} ms, "
+            f"p50 {cuts[49] * 1000:6.2f} ms, p95 {cuts[94] * 1000:6.2f} ms"
+        )
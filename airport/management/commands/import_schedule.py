@@ -0,0 +1,237 @@
+import csv
+import io
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from airport.caching import invalidate_flight_search
+from airport.models import Airplane, Crew, Flight, Route
+
+FLIGHT_COLUMNS = (
+    "route_id",
+    "airplane_id",
+    "departure_time",
+    "arrival_time",
+    "tickets_available",
+)
+
+
+def read_schedule(path):
+    """Yield schedule rows as dicts from a CSV, JSON or NDJSON file."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="") as schedule:
+        if extension == ".csv":
+            for row in csv.DictReader(schedule):
+                yield row
+        elif extension in (".ndjson", ".jsonl"):
+            for line in schedule:
+                if line.strip():
+                    yield json.loads(line)
+        elif extension == ".json":
+            yield from json.load(schedule)
+        else:
+            raise CommandError(f"Unsupported schedule format: {extension}")
+
+
+def parse_crew(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace(",", ";").split(";")
+    # A crew member listed twice would break the flight_crew unique key.
+    return list(dict.fromkeys(
+        int(crew_id) for crew_id in value if str(crew_id).strip()
+    ))
+
+
+def parse_time(value):
+    moment = parse_datetime(str(value))
+    if moment is None:
+        raise ValueError(f"invalid datetime {value!r}")
+    return make_aware(moment) if is_naive(moment) else moment
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Import a flight schedule from a CSV, JSON or NDJSON file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Schedule file to import")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Flights inserted per batch",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create even when PostgreSQL COPY is available",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.routes = set(Route.objects.values_list("id", flat=True))
+        self.capacities = {
+            airplane.id: airplane.capacity
+            for airplane in Airplane.objects.only("id", "rows", "seats_in_row")
+        }
+        self.crews = set(Crew.objects.values_list("id", flat=True))
+        self.seen = set()
+        self.use_copy = (
+            connection.vendor == "postgresql" and not options["no_copy"]
+        )
+        self.stats = {
+            "read": 0, "created": 0, "crew": 0, "duplicates": 0, "invalid": 0
+        }
+
+        rows = enumerate(read_schedule(options["path"]), start=1)
+        while batch := list(islice(rows, options["batch_size"])):
+            self.import_batch(batch)
+
+        if self.stats["created"]:
+            invalidate_flight_search()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {self.stats['read']} rows in {elapsed:.2f}s "
+            f"({self.stats['read'] / max(elapsed, 1e-6):.0f} rows/s): "
+            f"created {self.stats['created']} flights and "
+            f"{self.stats['crew']} crew links, skipped "
+            f"{self.stats['duplicates']} duplicates and "
+            f"{self.stats['invalid']} invalid rows "
+            f"({'COPY' if self.use_copy else 'bulk_create'})"
+        ))
+
+    def parse_row(self, number, row):
+        try:
+            route_id = int(row["route"])
+            airplane_id = int(row["airplane"])
+            flight = (
+                route_id,
+                airplane_id,
+                parse_time(row["departure_time"]),
+                parse_time(row["arrival_time"]),
+            )
+            crew = parse_crew(row.get("crew"))
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"row {number}: {error}")
+
+        if route_id not in self.routes:
+            raise ValueError(f"row {number}: unknown route {route_id}")
+        if airplane_id not in self.capacities:
+            raise ValueError(f"row {number}: unknown airplane {airplane_id}")
+        unknown_crew = set(crew) - self.crews
+        if unknown_crew:
+            raise ValueError(f"row {number}: unknown crew {unknown_crew}")
+        return flight, crew
+
+    def import_batch(self, batch):
+        flights = {}
+        for number, row in batch:
+            self.stats["read"] += 1
+            try:
+                flight, crew = self.parse_row(number, row)
+            except ValueError as error:
+                self.stats["invalid"] += 1
+                self.stderr.write(str(error))
+                continue
+            if flight in self.seen:
+                self.stats["duplicates"] += 1
+                continue
+            self.seen.add(flight)
+            flights[flight] = crew
+
+        existing = set(
+            Flight.objects.filter(
+                route_id__in={flight[0] for flight in flights},
+                departure_time__in={flight[2] for flight in flights},
+            ).values_list(
+                "route_id", "airplane_id", "departure_time", "arrival_time"
+            )
+        ) if flights else set()
+        for flight in existing & flights.keys():
+            self.stats["duplicates"] += 1
+            del flights[flight]
+        if not flights:
+            return
+
+        with transaction.atomic():
+            if self.use_copy:
+                flight_ids = self.copy_flights(flights)
+            else:
+                flight_ids = self.bulk_create_flights(flights)
+            links = [
+                (flight_ids[flight], crew_id)
+                for flight, crew in flights.items()
+                for crew_id in crew
+            ]
+            if self.use_copy:
+                self.copy_rows(
+                    Flight.crew.through._meta.db_table,
+                    ("flight_id", "crew_id"),
+                    links,
+                )
+            else:
+                Flight.crew.through.objects.bulk_create(
+                    Flight.crew.through(flight_id=flight_id, crew_id=crew_id)
+                    for flight_id, crew_id in links
+                )
+
+        self.stats["created"] += len(flights)
+        self.stats["crew"] += len(links)
+
+    def flight_row(self, flight):
+        return (*flight, self.capacities[flight[1]])
+
+    def bulk_create_flights(self, flights):
+        created = Flight.objects.bulk_create(
+            Flight(**dict(zip(FLIGHT_COLUMNS, self.flight_row(flight))))
+            for flight in flights
+        )
+        return {
+            flight: instance.id
+            for flight, instance in zip(flights, created)
+        }
+
+    def copy_flights(self, flights):
+        self.copy_rows(
+            Flight._meta.db_table,
+            FLIGHT_COLUMNS,
+            [self.flight_row(flight) for flight in flights],
+        )
+        created = Flight.objects.filter(
+            route_id__in={flight[0] for flight in flights},
+            departure_time__in={flight[2] for flight in flights},
+        ).values_list(
+            "id", "route_id", "airplane_id", "departure_time", "arrival_time"
+        )
+        return {
+            tuple(flight): flight_id
+            for flight_id, *flight in created
+            if tuple(flight) in flights
+        }
+
+    @staticmethod
+    def copy_rows(table, columns, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in row
+            )
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {connection.ops.quote_name(table)} "
+                f"({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from airport.caching import invalidate_flight_search
+from airport.models import Flight
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Rebuild and verify the stored tickets_available flight counters"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report flights with a stale counter, do not fix them",
+        )
+
+    def handle(self, *args, **options):
+        stale = Flight.objects.with_expected_tickets_available().exclude(
+            tickets_available=F("expected_tickets_available")
+        ).order_by().values_list(
+            "id", "tickets_available", "expected_tickets_available"
+        )
+        stale = list(stale)
+
+        for flight_id, stored, expected in stale:
+            self.stdout.write(
+                f"Flight {flight_id}: stored {stored}, expected {expected}"
+            )
+
+        if options["check"]:
+            if stale:
+                raise CommandError(f"{len(stale)} flight counter(s) stale")
+            self.stdout.write(self.style.SUCCESS("All counters are valid"))
+            return
+
+        updated = Flight.objects.filter(
+            id__in=[flight_id for flight_id, _, _ in stale]
+        ).refresh_tickets_available()
+        invalidate_flight_search()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {updated} flight counter(s)")
+        )
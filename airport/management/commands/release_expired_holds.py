@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from airport.models import SeatHold
+
+
+class Command(BaseCommand):
+    help = "Release expired seat holds"  # noqa: VNE003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and sweep every INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            released = SeatHold.objects.release_expired()
+            self.stdout.write(f"Released {released} expired seat hold(s)")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,118 @@
+import json
+import sys
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from airport.slow_queries import normalize_sql
+
+SORT_KEYS = {
+    "total": lambda group: group["total_ms"],
+    "count": lambda group: group["count"],
+    "max": lambda group: group["max_ms"],
+}
+
+
+def read_records(lines):
+    """JSON records from the log, skipping anything before the ``{``."""
+    for line in lines:
+        start = line.find("{")
+        if start == -1:
+            continue
+        try:
+            yield json.loads(line[start:])
+        except ValueError:
+            continue
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Summarize the slowest queries captured in the slow query log"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "log_file",
+            nargs="?",
+            default=settings.SLOW_QUERY["LOG_FILE"],
+            help="Slow query log, - for stdin (SLOW_QUERY_LOG_FILE)",
+        )
+        parser.add_argument("--top", type=int, default=10)
+        parser.add_argument(
+            "--sort", choices=sorted(SORT_KEYS), default="total"
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Show the slowest captured EXPLAIN of each query",
+        )
+
+    def handle(self, *args, **options):
+        log_file = options["log_file"]
+        if not log_file:
+            raise CommandError("Pass a log file or set SLOW_QUERY_LOG_FILE")
+
+        if log_file == "-":
+            groups = self.group(read_records(sys.stdin))
+        else:
+            try:
+                with open(log_file) as lines:
+                    groups = self.group(read_records(lines))
+            except OSError as exc:
+                raise CommandError(exc)
+
+        if not groups:
+            self.stdout.write("No slow queries captured")
+            return
+
+        offenders = sorted(
+            groups.values(), key=SORT_KEYS[options["sort"]], reverse=True
+        )
+        for rank, group in enumerate(offenders[:options["top"]], start=1):
+            self.write_group(rank, group, options["explain"])
+
+    @staticmethod
+    def group(records):
+        groups = defaultdict(lambda: {
+            "count": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "views": Counter(),
+            "frames": Counter(),
+            "explain": None,
+            "explain_ms": -1.0,
+        })
+        for record in records:
+            sql = normalize_sql(record.get("sql", ""))
+            duration = record.get("duration_ms", 0.0)
+            group = groups[sql]
+            group["sql"] = sql
+            group["count"] += 1
+            group["total_ms"] += duration
+            group["views"][record.get("view") or "-"] += 1
+            group["frames"][record.get("frame") or "-"] += 1
+            if record.get("explain") and duration > group["explain_ms"]:
+                group["explain"] = record["explain"]
+                group["explain_ms"] = duration
+            group["max_ms"] = max(group["max_ms"], duration)
+        return groups
+
+    def write_group(self, rank, group, show_explain):
+        mean = group["total_ms"] / group["count"]
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"#{rank}: {group['count']} call(s), "
+            f"total {group['total_ms']:.1f} ms, mean {mean:.1f} ms, "
+            f"max {group['max_ms']:.1f} ms"
+        ))
+        views = ", ".join(
+            f"{view} ({count})"
+            for view, count in group["views"].most_common(3)
+        )
+        self.stdout.write(f"  views: {views}")
+        self.stdout.write(f"  from:  {group['frames'].most_common(1)[0][0]}")
+        self.stdout.write(f"  sql:   {group['sql']}")
+        if show_explain and group["explain"]:
+            self.stdout.write("  explain:")
+            for line in group["explain"].splitlines():
+                self.stdout.write(f"    {line}")
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.7 on 2026-10-18 06:03
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_tickets_available(apps, schema_editor):
+    Airplane = apps.get_model("airport", "Airplane")
+    Flight = apps.get_model("airport", "Flight")
+    Ticket = apps.get_model("airport", "Ticket")
+
+    capacity = Airplane.objects.filter(
+        pk=OuterRef("airplane_id")
+    ).annotate(
+        capacity=F("rows") * F("seats_in_row")
+    ).values("capacity")
+    sold = Ticket.objects.filter(
+        flight=OuterRef("pk")
+    ).order_by().values("flight").annotate(
+        sold=Count("id")
+    ).values("sold")
+    Flight.objects.update(
+        tickets_available=Subquery(capacity) - Coalesce(Subquery(sold), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="tickets_available",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            fill_tickets_available, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.7 on 2026-10-18 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0002_flight_tickets_available"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="airport",
+            index=models.Index(
+                fields=["closest_big_city"],
+                name="airport_city_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["departure_time"], name="flight_departure_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "departure_time"], name="flight_route_departure_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.7 on 2026-10-18 06:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0006_catalog_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="order_user_created_at_idx",
+            ),
+        ),
+    ]
@@ -2,11 +2,16 @@ import os
 import uuid
 
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+from django.utils import timezone
 from django.utils.text import slugify
 from django.conf import settings
 from rest_framework.exceptions import ValidationError
 
+from airport.exceptions import SeatConflict
+
 
 class Crew(models.Model):
     first_name = models.CharField(max_length=64)
@@ -26,9 +31,27 @@ class Crew(models.Model):
 class Airport(models.Model):
     name = models.CharField(max_length=255)
     closest_big_city = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("closest_big_city",)
+        indexes = [
+            models.Index(
+                fields=["closest_big_city"],
+                name="airport_city_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
+    @staticmethod
+    def display_expression(prefix=""):
+        """SQL counterpart of ``__str__`` for annotating related airports."""
+        return Concat(
+            F(f"{prefix}closest_big_city"),
+            Value(": airport "),
+            F(f"{prefix}name"),
+            output_field=models.CharField(),
+        )
 
     def __str__(self):
         return f"{self.closest_big_city}: airport {self.name}"
@@ -46,6 +69,7 @@ class Route(models.Model):
         related_name="routes_as_destination"
     )
     distance = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("source", "destination", "distance")
@@ -57,6 +81,7 @@ class Route(models.Model):
 
 class AirplaneType(models.Model):
     name = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("name",)
@@ -92,6 +117,7 @@ class Airplane(models.Model):
         related_name="airplanes",
     )
     image = models.ImageField(null=True, upload_to=movie_image_file_path)
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def capacity(self) -> int:
@@ -100,11 +126,80 @@ class Airplane(models.Model):
     class Meta:
         ordering = ("name",)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(Airplane, cls).from_db(db, field_names, values)
+        instance._loaded_capacity = (
+            instance.__dict__.get("rows"),
+            instance.__dict__.get("seats_in_row"),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Recount the flights' ``tickets_available`` when the capacity
+        changed.
+        """
+        is_new = self._state.adding
+        super(Airplane, self).save(*args, **kwargs)
+        capacity = (self.rows, self.seats_in_row)
+        if not is_new and capacity != getattr(self, "_loaded_capacity", None):
+            self.flights.refresh_tickets_available()
+        self._loaded_capacity = capacity
+
     def __str__(self):
         return (f"{self.name} - type {self.airplane_type.name},  "
                 f"number of seats: {self.capacity}")
 
 
+class FlightQuerySet(models.QuerySet):
+    def for_listing(self, reference=None):
+        """Columns of the flight list.
+
+        Without a ``ReferenceData`` snapshot the display strings of the
+        route and airplane are joined in; with one the serializer resolves
+        them from ``route_id``/``airplane_id``.
+        """
+        queryset = self.only(
+            "id",
+            "departure_time",
+            "arrival_time",
+            "tickets_available",
+            "route_id",
+            "airplane_id",
+        )
+        if reference is not None:
+            return queryset
+        return queryset.annotate(
+            route_source_display=Airport.display_expression("route__source__"),
+            route_destination_display=Airport.display_expression(
+                "route__destination__"
+            ),
+            airplane_name=F("airplane__name"),
+        )
+
+    def with_expected_tickets_available(self):
+        return self.annotate(
+            expected_tickets_available=F("airplane__rows")
+            * F("airplane__seats_in_row")
+            - Count("tickets")
+        )
+
+    def refresh_tickets_available(self):
+        capacity = Airplane.objects.filter(
+            pk=OuterRef("airplane_id")
+        ).annotate(
+            capacity=F("rows") * F("seats_in_row")
+        ).values("capacity")
+        sold = Ticket.objects.filter(
+            flight=OuterRef("pk")
+        ).order_by().values("flight").annotate(
+            sold=Count("id")
+        ).values("sold")
+        return self.update(
+            tickets_available=Subquery(capacity) - Coalesce(Subquery(sold), 0)
+        )
+
+
 class Flight(models.Model):
     route = models.ForeignKey(
         Route,
@@ -119,6 +214,9 @@ class Flight(models.Model):
     crew = models.ManyToManyField(Crew)
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    tickets_available = models.IntegerField(default=0, editable=False)
+
+    objects = FlightQuerySet.as_manager()
 
     @property
     def flight_duration_minutes(self) -> int:
@@ -134,11 +232,81 @@ class Flight(models.Model):
             "departure_time",
             "arrival_time"
         )
+        indexes = [
+            models.Index(
+                fields=["departure_time"],
+                name="flight_departure_time_idx",
+            ),
+            models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(Flight, cls).from_db(db, field_names, values)
+        instance._loaded_airplane_id = instance.__dict__.get("airplane_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Set ``tickets_available`` on insert only.
+
+        Updates leave the counter out of the saved columns, so they never
+        overwrite a concurrent ticket adjustment, and recount it in SQL
+        when the airplane changed.
+        """
+        if self._state.adding:
+            sold = self.tickets.count() if self.pk else 0
+            self.tickets_available = self.airplane.capacity - sold
+            super(Flight, self).save(*args, **kwargs)
+            self._loaded_airplane_id = self.airplane_id
+            return
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            update_fields = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key
+            ]
+        kwargs["update_fields"] = [
+            field for field in update_fields
+            if field != "tickets_available"
+        ]
+        super(Flight, self).save(*args, **kwargs)
+
+        if self.airplane_id != getattr(self, "_loaded_airplane_id", None):
+            Flight.objects.filter(pk=self.pk).refresh_tickets_available()
+            self.refresh_from_db(fields=["tickets_available"])
+            self._loaded_airplane_id = self.airplane_id
+
+    @staticmethod
+    def adjust_tickets_available(flight_id, delta):
+        Flight.objects.filter(pk=flight_id).update(
+            tickets_available=F("tickets_available") + delta
+        )
 
     def __str__(self):
         return f"{self.route}: {self.departure_time} - {self.arrival_time}"
 
 
+class OrderQuerySet(models.QuerySet):
+    def history(self, reference=None):
+        """Orders with their tickets and flights in three queries.
+
+        Tickets and flights load only the columns of the order list and
+        every flight is read once, however many tickets share it.
+        """
+        tickets = Ticket.objects.only(
+            "id", "row", "seat", "flight_id", "order_id"
+        ).order_by("flight_id", "row", "seat").prefetch_related(
+            Prefetch("flight", queryset=Flight.objects.for_listing(reference))
+        )
+        return self.only("id", "created_at", "user_id").prefetch_related(
+            Prefetch("tickets", queryset=tickets)
+        )
+
+
 class Order(models.Model):
     created_at = models.DateTimeField()
     user = models.ForeignKey(
@@ -147,8 +315,20 @@ class Order(models.Model):
         related_name="orders",
     )
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         ordering = ("created_at", )
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"],
+                name="order_created_at_idx",
+            ),
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="order_user_created_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.created_at} - {self.user}"
@@ -206,9 +386,80 @@ class Ticket(models.Model):
             update_fields=None
     ):
         self.full_clean()
-        return super(Ticket, self).save(
-            force_insert, force_update, using, update_fields
-        )
+        with transaction.atomic():
+            return super(Ticket, self).save(
+                force_insert, force_update, using, update_fields
+            )
 
     def __str__(self):
         return f"{self.flight}  (row: {self.row}, seat: {self.seat})"
+
+
+class SeatHoldQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+    def release_expired(self):
+        deleted, _ = self.expired().delete()
+        return deleted
+
+    def hold(self, user, flight, row, seat):
+        """Reserve a seat for ``user`` until ``SEAT_HOLD_TTL`` passes.
+
+        Holding a seat the user already holds extends the hold. Raises
+        ``SeatConflict`` if the seat is sold or held by someone else.
+        """
+        seat_lookup = {"flight": flight, "row": row, "seat": seat}
+        expires_at = timezone.now() + settings.SEAT_HOLD_TTL
+
+        with transaction.atomic():
+            self.filter(**seat_lookup).expired().delete()
+            if Ticket.objects.filter(**seat_lookup).exists():
+                raise SeatConflict()
+
+            current = self.select_for_update(skip_locked=True).filter(
+                **seat_lookup
+            ).first()
+            if current is not None:
+                if current.user_id != user.id:
+                    raise SeatConflict()
+                current.expires_at = expires_at
+                current.save(update_fields=["expires_at"])
+                return current
+
+            try:
+                with transaction.atomic():
+                    return self.create(
+                        user=user, expires_at=expires_at, **seat_lookup
+                    )
+            except IntegrityError:
+                raise SeatConflict()
+
+
+class SeatHold(models.Model):
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    row = models.PositiveIntegerField()
+    seat = models.PositiveIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds",
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("row", "seat", "flight")
+        ordering = ("expires_at",)
+
+    def __str__(self):
+        return (f"{self.flight_id} (row: {self.row}, seat: {self.seat}) "
+                f"held until {self.expires_at}")
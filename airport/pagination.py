@@ -0,0 +1,70 @@
+from rest_framework.pagination import (
+    CursorPagination,
+    LimitOffsetPagination,
+)
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination with an opt-out of the total count.
+
+    Pages are addressed by the position of the last row on the indexed
+    ``ordering`` columns, so fetching a page costs the same at any depth.
+    ``?count=false`` skips the ``COUNT(*)`` for clients that do not need
+    it. Requests with ``?offset=`` keep the previous limit/offset pages.
+    """
+
+    page_size_query_param = "limit"
+    max_page_size = 100
+    count_query_param = "count"
+    offset_query_param = "offset"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.offset_paginator = None
+        if self.offset_query_param in request.query_params:
+            self.offset_paginator = LimitOffsetPagination()
+            self.offset_paginator.default_limit = self.page_size
+            self.offset_paginator.max_limit = self.max_page_size
+            return self.offset_paginator.paginate_queryset(
+                queryset.order_by(*self.ordering), request, view
+            )
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) not in (
+            "0", "false"
+        ):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.offset_paginator is not None:
+            return self.offset_paginator.get_paginated_response(data)
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {"count": self.count, **response.data}
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"] = {
+            "count": {
+                "type": "integer",
+                "example": 123,
+                "description": (
+                    f"Left out with ?{self.count_query_param}=false"
+                ),
+            },
+            **response_schema["properties"],
+        }
+        return response_schema
+
+
+class FlightPagination(KeysetPagination):
+    ordering = ("departure_time", "id")
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("created_at", "id")
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, router
+from django.utils.functional import cached_property
+
+from airport.generations import bump_generation, current_generation
+from airport.models import Airplane, AirplaneType, Airport, Route
+
+REFERENCE_DATA_GENERATION_KEY = "reference-data:generation"
+
+
+class ReferenceData:
+    """Immutable ``id -> tuple`` maps of the reference tables.
+
+    ``airports``: (name, closest_big_city)
+    ``routes``: (source_id, destination_id, distance)
+    ``airplane_types``: (name,)
+    ``airplanes``: (name, rows, seats_in_row, airplane_type_id)
+    """
+
+    def __init__(self, generation, airports, routes, airplane_types,
+                 airplanes):
+        self.generation = generation
+        self.airports = MappingProxyType(airports)
+        self.routes = MappingProxyType(routes)
+        self.airplane_types = MappingProxyType(airplane_types)
+        self.airplanes = MappingProxyType(airplanes)
+
+    @classmethod
+    def load(cls, generation, using, max_rows):
+        """Read the tables, or return ``None`` if one has over max_rows."""
+        tables = []
+        for model, fields in (
+            (Airport, ("name", "closest_big_city")),
+            (Route, ("source_id", "destination_id", "distance")),
+            (AirplaneType, ("name",)),
+            (Airplane, ("name", "rows", "seats_in_row", "airplane_type_id")),
+        ):
+            rows = model.objects.using(using).order_by().values_list(
+                "id", *fields
+            )[:max_rows + 1]
+            table = {row[0]: row[1:] for row in rows}
+            if len(table) > max_rows:
+                return None
+            tables.append(table)
+        return cls(generation, *tables)
+
+    def airport_display(self, airport_id):
+        name, city = self.airports[airport_id]
+        return f"{city}: airport {name}"
+
+    def airport_city(self, airport_id):
+        return self.airports[airport_id][1]
+
+    def route_source_display(self, route_id):
+        return self.airport_display(self.routes[route_id][0])
+
+    def route_destination_display(self, route_id):
+        return self.airport_display(self.routes[route_id][1])
+
+    def airplane_name(self, airplane_id):
+        return self.airplanes[airplane_id][0]
+
+    def airplane_type_name(self, airplane_type_id):
+        return self.airplane_types[airplane_type_id][0]
+
+    @cached_property
+    def airport_list(self):
+        """Airports as model instances, in ``Airport.Meta.ordering``."""
+        return tuple(
+            Airport(id=airport_id, name=name, closest_big_city=city)
+            for airport_id, (name, city) in sorted(
+                self.airports.items(), key=lambda item: (item[1][1], item[0])
+            )
+        )
+
+    @cached_property
+    def airplane_type_list(self):
+        return tuple(
+            AirplaneType(id=airplane_type_id, name=name)
+            for airplane_type_id, (name,) in sorted(
+                self.airplane_types.items(),
+                key=lambda item: (item[1][0], item[0]),
+            )
+        )
+
+
+def reference_data_cache():
+    return caches[settings.REFERENCE_DATA["ALIAS"]]
+
+
+def reference_data_generation():
+    """The current generation; it expires after ``REFERENCE_DATA["TIMEOUT"]``
+    so a missed invalidation only lasts that long.
+    """
+    return current_generation(
+        reference_data_cache(),
+        REFERENCE_DATA_GENERATION_KEY,
+        settings.REFERENCE_DATA["TIMEOUT"],
+    ) or ""
+
+
+_lock = threading.Lock()
+_current = (None, None)
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def reference_data():
+    """This process's snapshot for the current generation, or ``None``.
+
+    ``None`` means callers have to join: the cache is disabled, a table is
+    over ``MAX_ROWS``, a transaction is open (its rows may still roll back)
+    or a stale snapshot would have to be reloaded from async code.
+    """
+    global _current
+
+    max_rows = settings.REFERENCE_DATA["MAX_ROWS"]
+    using = router.db_for_write(Airport)
+    if not max_rows or connections[using].in_atomic_block:
+        return None
+
+    generation = reference_data_generation()
+    loaded_generation, snapshot = _current
+    if loaded_generation == generation:
+        return snapshot
+    if _in_event_loop():
+        return None
+
+    with _lock:
+        loaded_generation, snapshot = _current
+        if loaded_generation != generation:
+            snapshot = ReferenceData.load(generation, using, max_rows)
+            _current = (generation, snapshot)
+    return snapshot
+
+
+def invalidate_reference_data():
+    """Make every process reload its snapshot, now and on commit."""
+    global _current
+
+    _current = (None, None)
+    bump_generation(
+        reference_data_cache(),
+        REFERENCE_DATA_GENERATION_KEY,
+        settings.REFERENCE_DATA["TIMEOUT"],
+    )
+
+
+class ReferenceDataMixin:
+    """Pass the reference data snapshot of the request to serializers."""
+
+    @cached_property
+    def reference_data(self):
+        return reference_data()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["reference_data"] = self.reference_data
+        return context
@@ -0,0 +1,51 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` encoding with orjson when it is installed.
+
+    The output is the same as ``JSONRenderer``'s: values orjson does not
+    encode the same way (datetimes, decimals, lazy strings) go through
+    the DRF encoder; NaN and infinities become ``null`` instead of an
+    error. Indented or non-default (ASCII, non-compact,
+    non-strict) output, and anything orjson cannot encode, is left to the
+    stdlib encoder.
+    """
+
+    options = orjson and (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=self.options,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        # Same escaping as JSONRenderer, for JavaScript string literals.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -0,0 +1,73 @@
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_read_from_replica = contextvars.ContextVar(
+    "read_from_replica", default=False
+)
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    """Send reads inside the block to ``DATABASE_REPLICAS``."""
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+def read_from_primary():
+    """Send reads inside the block to ``default`` again.
+
+    For responses that outlive the request (cached, or sent with
+    validators clients revalidate against): built from a lagging replica
+    they would keep stale rows under a version that is already current.
+    """
+    return read_from_replica(enabled=False)
+
+
+class ReplicaRouter:
+    """Route reads to a random replica inside ``read_from_replica()``.
+
+    Everything else, and any read while a transaction is open on the
+    primary, goes to ``default`` so writes are always read back from the
+    database they were made on.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or not _read_from_replica.get()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """Serve safe-method requests of a read-mostly viewset from replicas.
+
+    The flight search cache and the ETag'd catalog responses are still
+    built from the primary, see ``read_from_primary()``.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,475 @@
+import copy
+import random
+import threading
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from heapq import heappop, heappush
+from itertools import count
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, router, transaction
+
+from airport.generations import current_generation
+from airport.models import Flight, Route
+
+ROUTE_GRAPH_VERSION_KEY = "route-graph:version"
+# Processes further behind than this reload the graph from the database.
+ROUTE_CHANGE_TIMEOUT = 24 * 60 * 60
+
+INFINITY = float("inf")
+
+
+class RouteGraph:
+    """Directed airport graph of the ``Route`` table.
+
+    ``adjacency[source][destination]`` (and ``reverse[destination][source]``)
+    is ``(distance, route_id)`` of the shortest route between the pair.
+    ``with_changes()`` applies single route changes to a copy that shares
+    every adjacency row it does not touch, so a published graph is never
+    mutated while it is being searched.
+    """
+
+    def __init__(self, version=None):
+        self.version = version
+        self.routes = {}
+        self.pairs = {}
+        self.adjacency = {}
+        self.reverse = {}
+        self._landmarks = None
+        self._copied = None
+
+    @classmethod
+    def load(cls, version, using):
+        graph = cls(version)
+        for route in Route.objects.using(using).order_by().values_list(
+            "id", "source_id", "destination_id", "distance"
+        ).iterator():
+            graph.put_route(*route)
+        return graph
+
+    def with_changes(self, version, changes):
+        """A copy with ``(route_id, (source, destination, distance))``
+        changes applied; ``None`` instead of the tuple removes the route.
+        """
+        graph = copy.copy(self)
+        graph.version = version
+        graph.routes = dict(self.routes)
+        graph.pairs = dict(self.pairs)
+        graph.adjacency = dict(self.adjacency)
+        graph.reverse = dict(self.reverse)
+        graph._copied = set()
+        for route_id, route in changes:
+            if route is None:
+                graph.remove_route(route_id)
+            else:
+                graph.put_route(route_id, *route)
+        graph._copied = None
+        return graph
+
+    def _row(self, mapping, key):
+        """``mapping[key]``, copied first if it is shared with another graph.
+        """
+        if self._copied is None:
+            return mapping.setdefault(key, {})
+        if (id(mapping), key) not in self._copied:
+            mapping[key] = dict(mapping.get(key, ()))
+            self._copied.add((id(mapping), key))
+        return mapping.setdefault(key, {})
+
+    def put_route(self, route_id, source, destination, distance):
+        route = (source, destination, distance)
+        if self.routes.get(route_id) == route:
+            return
+        self.remove_route(route_id)
+        self.routes[route_id] = route
+        self._row(self.pairs, (source, destination))[route_id] = distance
+        self._update_edge(source, destination)
+
+    def remove_route(self, route_id):
+        if route_id not in self.routes:
+            return
+        source, destination, _ = self.routes.pop(route_id)
+        pair = self._row(self.pairs, (source, destination))
+        del pair[route_id]
+        if not pair:
+            del self.pairs[source, destination]
+        self._update_edge(source, destination)
+
+    def _update_edge(self, source, destination):
+        old_edge = self.adjacency.get(source, {}).get(destination)
+        pair = self.pairs.get((source, destination))
+        if pair:
+            route_id = min(pair, key=lambda route: (pair[route], route))
+            edge = (pair[route_id], route_id)
+            self._row(self.adjacency, source)[destination] = edge
+            self._row(self.reverse, destination)[source] = edge
+        else:
+            edge = None
+            self._row(self.adjacency, source).pop(destination, None)
+            self._row(self.reverse, destination).pop(source, None)
+
+        # Longer or removed edges keep the landmark bounds admissible.
+        if edge is not None and (old_edge is None or edge[0] < old_edge[0]):
+            self._landmarks = None
+
+    def distances(self, start, edges=None):
+        """Shortest distances from ``start`` to every reachable airport."""
+        edges = self.adjacency if edges is None else edges
+        distances = {start: 0}
+        heap = [(0, start)]
+        while heap:
+            distance, node = heappop(heap)
+            if distance > distances[node]:
+                continue
+            for neighbour, (length, _) in edges.get(node, {}).items():
+                candidate = distance + length
+                if candidate < distances.get(neighbour, INFINITY):
+                    distances[neighbour] = candidate
+                    heappush(heap, (candidate, neighbour))
+        return distances
+
+    @property
+    def landmarks(self):
+        """``(from landmark, to landmark)`` distance maps for A*.
+
+        Landmarks are picked farthest-first and computed on the first
+        search after a route got shorter or was added.
+        """
+        if self._landmarks is None:
+            self._landmarks = self._select_landmarks(
+                settings.ROUTE_GRAPH["LANDMARKS"]
+            )
+        return self._landmarks
+
+    def _select_landmarks(self, number):
+        nodes = sorted(set(self.adjacency) | set(self.reverse))
+        if not nodes or not number:
+            return ()
+        landmarks = []
+        closest = dict.fromkeys(nodes, INFINITY)
+        landmark = nodes[0]
+        while len(landmarks) < min(number, len(nodes)):
+            from_landmark = self.distances(landmark)
+            landmarks.append(
+                (from_landmark, self.distances(landmark, self.reverse))
+            )
+            for node in closest:
+                closest[node] = min(
+                    closest[node], from_landmark.get(node, INFINITY)
+                )
+            landmark = max(closest, key=closest.get)
+            if closest[landmark] == 0:
+                break
+        return tuple(landmarks)
+
+    def heuristic(self, target):
+        """Lower bound of the distance to ``target`` (ALT landmarks)."""
+        bounds = [
+            (from_landmark, from_landmark.get(target),
+             to_landmark, to_landmark.get(target))
+            for from_landmark, to_landmark in self.landmarks
+        ]
+
+        def estimate(node):
+            best = 0
+            for from_landmark, from_target, to_landmark, to_target in bounds:
+                from_node = from_landmark.get(node)
+                if from_node is not None and from_target is not None:
+                    best = max(best, from_target - from_node)
+                to_node = to_landmark.get(node)
+                if to_node is not None and to_target is not None:
+                    best = max(best, to_node - to_target)
+            return best
+        return estimate
+
+    def shortest_path(self, source, target, max_legs=None, use_landmarks=True,
+                      banned_airports=frozenset(),
+                      banned_edges=frozenset()):
+        """``(distance, airports, routes)`` of the shortest path, or ``None``.
+
+        A* with the landmark heuristic, plain Dijkstra without it. With
+        ``max_legs`` the search runs over ``(airport, legs)`` states.
+        """
+        if source == target or source in banned_airports:
+            return None
+        estimate = (
+            self.heuristic(target) if use_landmarks else lambda node: 0
+        )
+        start = (source, 0)
+        best = {start: 0}
+        parents = {start: None}
+        tie = count()
+        heap = [(estimate(source), next(tie), 0, start)]
+        while heap:
+            _, _, distance, state = heappop(heap)
+            if distance > best[state]:
+                continue
+            node, legs = state
+            if node == target:
+                return self._path(distance, state, parents)
+            if max_legs is not None and legs >= max_legs:
+                continue
+            next_legs = 0 if max_legs is None else legs + 1
+            for neighbour, (length, route_id) in self.adjacency.get(
+                node, {}
+            ).items():
+                if (
+                    neighbour in banned_airports
+                    or (node, neighbour) in banned_edges
+                ):
+                    continue
+                next_state = (neighbour, next_legs)
+                candidate = distance + length
+                if candidate < best.get(next_state, INFINITY):
+                    best[next_state] = candidate
+                    parents[next_state] = (state, route_id)
+                    heappush(heap, (
+                        candidate + estimate(neighbour),
+                        next(tie),
+                        candidate,
+                        next_state,
+                    ))
+        return None
+
+    @staticmethod
+    def _path(distance, state, parents):
+        airports = [state[0]]
+        routes = []
+        while parents[state] is not None:
+            state, route_id = parents[state]
+            airports.append(state[0])
+            routes.append(route_id)
+        return distance, tuple(reversed(airports)), tuple(reversed(routes))
+
+    def k_shortest_paths(self, source, target, number, max_legs=None):
+        """Up to ``number`` loopless paths by increasing distance (Yen)."""
+        first = self.shortest_path(source, target, max_legs)
+        if first is None:
+            return []
+        paths = [first]
+        seen = {first[1]}
+        candidates = []
+        while len(paths) < number:
+            _, airports, routes = paths[-1]
+            for index in range(len(airports) - 1):
+                root = airports[:index + 1]
+                banned_edges = {
+                    (path[1][index], path[1][index + 1])
+                    for path in paths
+                    if path[1][:index + 1] == root
+                }
+                spur = self.shortest_path(
+                    root[-1],
+                    target,
+                    None if max_legs is None else max_legs - index,
+                    banned_airports=frozenset(root[:-1]),
+                    banned_edges=frozenset(banned_edges),
+                )
+                if spur is None:
+                    continue
+                path = (
+                    sum(self.routes[route][2] for route in routes[:index])
+                    + spur[0],
+                    root[:-1] + spur[1],
+                    routes[:index] + spur[2],
+                )
+                if path[1] not in seen:
+                    seen.add(path[1])
+                    heappush(candidates, path)
+            if not candidates:
+                break
+            paths.append(heappop(candidates))
+        return paths
+
+
+def route_graph_cache():
+    return caches[settings.ROUTE_GRAPH["ALIAS"]]
+
+
+def route_change_key(version):
+    return f"route-graph:change:{version}"
+
+
+def route_graph_version():
+    # A random start, so a journal restarted after a cache flush does not
+    # continue numbering a process has already applied.
+    return current_generation(
+        route_graph_cache(),
+        ROUTE_GRAPH_VERSION_KEY,
+        new=lambda: random.getrandbits(48),
+    ) or 0
+
+
+_lock = threading.Lock()
+_current = None
+
+
+def _catch_up(graph, version, using):
+    """Replay the journalled changes onto ``graph`` or reload it."""
+    if (
+        graph is not None
+        and 0 < version - graph.version <= settings.ROUTE_GRAPH["MAX_REPLAY"]
+    ):
+        keys = [
+            route_change_key(number)
+            for number in range(graph.version + 1, version + 1)
+        ]
+        changes = route_graph_cache().get_many(keys)
+        if len(changes) == len(keys):
+            return graph.with_changes(
+                version, [changes[key] for key in keys]
+            )
+    return RouteGraph.load(version, using)
+
+
+def route_graph():
+    """This process's route graph, caught up with the change journal.
+
+    Inside a transaction a private graph is loaded instead, so routes that
+    may still roll back never reach the shared one.
+    """
+    global _current
+
+    using = router.db_for_write(Route)
+    if connections[using].in_atomic_block:
+        return RouteGraph.load(None, using)
+
+    version = route_graph_version()
+    graph = _current
+    if graph is not None and graph.version == version:
+        return graph
+
+    with _lock:
+        graph = _current
+        if graph is None or graph.version != version:
+            graph = _catch_up(graph, version, using)
+            _current = graph
+    return graph
+
+
+def _record_route_change(route_id, route):
+    cache = route_graph_cache()
+    try:
+        version = cache.incr(ROUTE_GRAPH_VERSION_KEY)
+    except ValueError:
+        # No journal: the next reader starts one and reloads its graph.
+        return
+    cache.set(
+        route_change_key(version), (route_id, route), ROUTE_CHANGE_TIMEOUT
+    )
+
+
+def record_route_change(route, deleted=False):
+    """Journal the route's new state for every process, on commit."""
+    route_id = route.pk
+    change = None if deleted else (
+        route.source_id, route.destination_id, route.distance
+    )
+    transaction.on_commit(lambda: _record_route_change(route_id, change))
+
+
+class Connection:
+    """Flights along one route path, each leaving after the layover."""
+
+    def __init__(self, distance, flights):
+        self.distance = distance
+        self.flights = flights
+
+    @property
+    def departure_time(self):
+        return self.flights[0].departure_time
+
+    @property
+    def arrival_time(self):
+        return self.flights[-1].arrival_time
+
+    @property
+    def duration_minutes(self):
+        return int(
+            (self.arrival_time - self.departure_time).total_seconds() / 60
+        )
+
+    @property
+    def layover_minutes(self):
+        return [
+            int((
+                following.departure_time - previous.arrival_time
+            ).total_seconds() / 60)
+            for previous, following in zip(self.flights, self.flights[1:])
+        ]
+
+
+def _flights_by_route(route_ids, reference, **lookups):
+    by_route = defaultdict(list)
+    for flight in Flight.objects.for_listing(reference).filter(
+        route_id__in=route_ids, **lookups
+    ).order_by("departure_time", "id"):
+        by_route[flight.route_id].append(flight)
+    return {
+        route_id: (
+            [flight.departure_time for flight in flights], flights
+        )
+        for route_id, flights in by_route.items()
+    }
+
+
+def find_connections(paths, departure_from, departure_to, min_layover,
+                     max_layover, reference=None):
+    """Connections along ``paths`` whose first flight leaves in
+    ``[departure_from, departure_to)``.
+
+    ``paths`` come from ``RouteGraph.k_shortest_paths()``. For every
+    first flight, each next leg is the earliest arriving flight of the
+    route leaving ``min_layover`` to ``max_layover`` after the previous
+    arrival. Flights are read with one query per leg position.
+    """
+    partial = [(path, ()) for path in paths if path[2]]
+    connections = []
+    leg = 0
+    while partial:
+        if leg == 0:
+            window = {
+                "departure_time__gte": departure_from,
+                "departure_time__lt": departure_to,
+            }
+        else:
+            ready = [flights[-1].arrival_time for _, flights in partial]
+            window = {"departure_time__range": (
+                min(ready) + min_layover, max(ready) + max_layover
+            )}
+        flights_by_route = _flights_by_route(
+            {path[2][leg] for path, _ in partial}, reference, **window
+        )
+
+        next_partial = []
+        for path, flights in partial:
+            departures, candidates = flights_by_route.get(
+                path[2][leg], ((), ())
+            )
+            if leg == 0:
+                legs = [(flight,) for flight in candidates]
+            else:
+                ready = flights[-1].arrival_time
+                feasible = candidates[
+                    bisect_left(departures, ready + min_layover):
+                    bisect_right(departures, ready + max_layover)
+                ]
+                legs = [flights + (min(
+                    feasible,
+                    key=lambda flight: (flight.arrival_time, flight.id),
+                ),)] if feasible else []
+            for chosen in legs:
+                if len(chosen) == len(path[2]):
+                    connections.append(Connection(path[0], list(chosen)))
+                else:
+                    next_partial.append((path, chosen))
+        partial = next_partial
+        leg += 1
+
+    connections.sort(key=lambda connection: (
+        connection.arrival_time,
+        -connection.departure_time.timestamp(),
+        connection.distance,
+    ))
+    return connections
@@ -0,0 +1,96 @@
+import base64
+
+from airport.models import Ticket
+
+
+class SeatMap:
+    """Seat occupancy of one flight packed into a bitset.
+
+    Seat ``(row, seat)`` maps to bit ``(row - 1) * seats_in_row + seat - 1``,
+    stored least significant bit first. ``rows`` and ``seats_in_row``
+    mirror ``Airplane``, so a seat map can be passed to
+    ``Ticket.validate_ticket`` in place of the airplane.
+
+    Seats outside the grid (sold before the airplane was shrunk) are kept
+    in a set next to the bitset; they are listed by ``taken()`` but cannot
+    be encoded in the bitmap.
+    """
+
+    __slots__ = ("rows", "seats_in_row", "_bits", "_outside")
+
+    def __init__(self, rows, seats_in_row, taken=()):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self._bits = bytearray((rows * seats_in_row + 7) // 8)
+        self._outside = set()
+        for row, seat in taken:
+            self.take(row, seat)
+
+    @classmethod
+    def for_flight(cls, flight):
+        return cls(
+            flight.airplane.rows,
+            flight.airplane.seats_in_row,
+            Ticket.objects.filter(flight=flight).values_list("row", "seat"),
+        )
+
+    @classmethod
+    async def afor_flight(cls, flight):
+        seat_map = cls(flight.airplane.rows, flight.airplane.seats_in_row)
+        taken = Ticket.objects.filter(flight=flight).values_list("row", "seat")
+        async for row, seat in taken:
+            seat_map.take(row, seat)
+        return seat_map
+
+    @classmethod
+    def for_flights(cls, flights):
+        seat_maps = {
+            flight.id: cls(flight.airplane.rows, flight.airplane.seats_in_row)
+            for flight in flights
+        }
+        taken = Ticket.objects.filter(
+            flight_id__in=seat_maps
+        ).values_list("flight_id", "row", "seat")
+        for flight_id, row, seat in taken:
+            seat_maps[flight_id].take(row, seat)
+        return seat_maps
+
+    @classmethod
+    def from_bitmap(cls, rows, seats_in_row, bitmap):
+        seat_map = cls(rows, seats_in_row)
+        seat_map._bits[:] = base64.b64decode(bitmap)
+        return seat_map
+
+    def _position(self, row, seat):
+        index = (row - 1) * self.seats_in_row + seat - 1
+        return index >> 3, 1 << (index & 7)
+
+    def _in_grid(self, row, seat):
+        return 1 <= row <= self.rows and 1 <= seat <= self.seats_in_row
+
+    def is_free(self, row, seat):
+        if not self._in_grid(row, seat):
+            return (row, seat) not in self._outside
+        byte, mask = self._position(row, seat)
+        return not self._bits[byte] & mask
+
+    def take(self, row, seat):
+        if not self._in_grid(row, seat):
+            self._outside.add((row, seat))
+            return
+        byte, mask = self._position(row, seat)
+        self._bits[byte] |= mask
+
+    def taken(self):
+        seats = (
+            (row, seat)
+            for row in range(1, self.rows + 1)
+            for seat in range(1, self.seats_in_row + 1)
+            if not self.is_free(row, seat)
+        )
+        if self._outside:
+            seats = sorted([*seats, *self._outside])
+        yield from seats
+
+    def to_bitmap(self):
+        return base64.b64encode(bytes(self._bits)).decode("ascii")
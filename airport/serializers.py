@@ -1,7 +1,14 @@
-from django.db import transaction
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from airport.caching import invalidate_flight_search
+from airport.exceptions import SeatConflict
 from airport.models import (
     Crew,
     Airport,
@@ -10,11 +17,45 @@ from airport.models import (
     Flight,
     Airplane,
     Order,
+    SeatHold,
     Ticket
 )
+from airport.seatmap import SeatMap
 from user.serializers import UserDetailSerializer
 
 
+class AnnotatedCharField(serializers.CharField):
+    """Read-only field preferring a queryset annotation over ``source``.
+
+    Lists built from ``Flight.objects.for_listing()`` get their display
+    strings from SQL. Without the annotation, ``reference`` names a
+    ``ReferenceData`` method and the id attribute to pass it, resolved
+    from the ``reference_data`` snapshot in the serializer context; other
+    instances fall back to the related objects.
+    """
+
+    def __init__(self, annotation=None, reference=None, **kwargs):
+        self.annotation = annotation
+        self.reference = reference
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if self.annotation and hasattr(instance, self.annotation):
+            return getattr(instance, self.annotation)
+
+        snapshot = self.context.get("reference_data")
+        if snapshot is not None and self.reference is not None:
+            method, id_attribute = self.reference
+            try:
+                return getattr(snapshot, method)(
+                    getattr(instance, id_attribute)
+                )
+            except KeyError:
+                pass
+        return super().get_attribute(instance)
+
+
 class CrewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Crew
@@ -34,11 +75,12 @@ class RouteSerializer(serializers.ModelSerializer):
 
 
 class RouteListSerializer(RouteSerializer):
-    source_city = serializers.CharField(
-        source="source.closest_big_city",
-        read_only=True
+    source_city = AnnotatedCharField(
+        reference=("airport_city", "source_id"),
+        source="source.closest_big_city"
     )
-    destination_city = serializers.CharField(
+    destination_city = AnnotatedCharField(
+        reference=("airport_city", "destination_id"),
         source="destination.closest_big_city"
     )
 
@@ -73,9 +115,9 @@ class AirplaneTypeSerializer(serializers.ModelSerializer):
 
 
 class AirplaneSerializer(serializers.ModelSerializer):
-    airplane_type_name = serializers.CharField(
-        source="airplane_type.name",
-        read_only=True
+    airplane_type_name = AnnotatedCharField(
+        reference=("airplane_type_name", "airplane_type_id"),
+        source="airplane_type.name"
     )
     airplane_type = serializers.PrimaryKeyRelatedField(
         queryset=AirplaneType.objects.all(),
@@ -120,12 +162,21 @@ class FlightSerializer(serializers.ModelSerializer):
 
 
 class FlightListSerializer(FlightSerializer):
-    route_source = serializers.CharField(source="route.source", read_only=True)
-    route_destination = serializers.CharField(
-        source="route.destination",
-        read_only=True
+    route_source = AnnotatedCharField(
+        "route_source_display",
+        reference=("route_source_display", "route_id"),
+        source="route.source"
+    )
+    route_destination = AnnotatedCharField(
+        "route_destination_display",
+        reference=("route_destination_display", "route_id"),
+        source="route.destination"
+    )
+    airplane = AnnotatedCharField(
+        "airplane_name",
+        reference=("airplane_name", "airplane_id"),
+        source="airplane.name"
     )
-    airplane = serializers.CharField(source="airplane.name", read_only=True)
     tickets_available = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -157,6 +208,63 @@ class TicketSerializer(serializers.ModelSerializer):
         fields = ("id", "row", "seat", "flight", "order")
 
 
+class FlightPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Resolve each distinct flight once per serializer instance.
+
+    Nested in a ``many=True`` serializer the child is reused for every
+    item, so all tickets of one flight share a single ``Flight`` (with
+    its airplane already joined) instead of one lookup per ticket.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault(
+            "queryset", Flight.objects.select_related("airplane")
+        )
+        super().__init__(**kwargs)
+        self._resolved = {}
+
+    def to_internal_value(self, data):
+        # Lists, objects and the like fail with the usual field errors.
+        if type(data) not in (str, int):
+            return super().to_internal_value(data)
+        if data not in self._resolved:
+            self._resolved[data] = super().to_internal_value(data)
+        return self._resolved[data]
+
+
+class TicketBatchSerializer(serializers.ListSerializer):
+    unique_error = "The fields row, seat, flight must make a unique set."
+
+    def to_internal_value(self, data):
+        attrs = super().to_internal_value(data)
+        seat_maps = SeatMap.for_flights(
+            {ticket["flight"] for ticket in attrs}
+        )
+
+        errors = []
+        for ticket in attrs:
+            seat_map = seat_maps[ticket["flight"].id]
+            if seat_map.is_free(ticket["row"], ticket["seat"]):
+                seat_map.take(ticket["row"], ticket["seat"])
+                errors.append({})
+            else:
+                errors.append({"non_field_errors": [self.unique_error]})
+
+        if any(errors):
+            raise ValidationError(errors)
+        return attrs
+
+
+class OrderTicketSerializer(TicketSerializer):
+    flight = FlightPrimaryKeyRelatedField()
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "flight")
+        list_serializer_class = TicketBatchSerializer
+        validators = []
+
+
 class TicketListSerializer(TicketSerializer):
     flight = FlightListSerializer(read_only=True, many=False)
 
@@ -167,7 +275,7 @@ class TicketListSerializer(TicketSerializer):
 
 class OrderSerializer(serializers.ModelSerializer):
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
-    tickets = TicketSerializer(
+    tickets = OrderTicketSerializer(
         many=True,
         required=False,
         allow_empty=True
@@ -182,12 +290,51 @@ class OrderSerializer(serializers.ModelSerializer):
         )
 
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets", [])
-            order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
-            return order
+        try:
+            with transaction.atomic():
+                tickets_data = validated_data.pop("tickets", [])
+                order = Order.objects.create(**validated_data)
+                self.claim_seat_holds(order.user, tickets_data)
+                tickets = Ticket.objects.bulk_create(
+                    Ticket(order=order, **ticket_data)
+                    for ticket_data in tickets_data
+                )
+                sold = Counter(ticket.flight_id for ticket in tickets)
+                for flight_id, count in sold.items():
+                    Flight.adjust_tickets_available(flight_id, -count)
+        except IntegrityError:
+            raise SeatConflict()
+
+        if sold:
+            invalidate_flight_search()
+        return order
+
+    @staticmethod
+    def claim_seat_holds(user, tickets_data):
+        """Consume the user's holds on the ordered seats.
+
+        Raises ``SeatConflict`` if another user holds one of them.
+        """
+        if not tickets_data:
+            return
+        seats = Q()
+        for ticket_data in tickets_data:
+            seats |= Q(
+                flight=ticket_data["flight"],
+                row=ticket_data["row"],
+                seat=ticket_data["seat"],
+            )
+        holds = list(SeatHold.objects.select_for_update().filter(seats))
+        now = timezone.now()
+        if any(
+            hold.user_id != user.id and hold.expires_at > now
+            for hold in holds
+        ):
+            raise SeatConflict()
+        if holds:
+            SeatHold.objects.filter(
+                pk__in=[hold.pk for hold in holds]
+            ).delete()
 
 
 class OrderListSerializer(OrderSerializer):
@@ -208,9 +355,7 @@ class FlightDetailSerializer(FlightSerializer):
         slug_field="full_name"
     )
     airplane = AirplaneSerializer(read_only=True, many=False)
-    taken_places = TicketSeatsSerializer(
-        source="tickets", many=True, read_only=True
-    )
+    taken_places = serializers.SerializerMethodField()
 
     class Meta:
         model = Flight
@@ -224,3 +369,54 @@ class FlightDetailSerializer(FlightSerializer):
             "crew",
             "taken_places"
         )
+
+    @extend_schema_field(TicketSeatsSerializer(many=True))
+    def get_taken_places(self, flight):
+        seat_map = self.context.get("seat_map") or SeatMap.for_flight(flight)
+        if self.context.get("seatmap") == "bitmap":
+            return {
+                "rows": seat_map.rows,
+                "seats_in_row": seat_map.seats_in_row,
+                "bitmap": seat_map.to_bitmap(),
+            }
+        return [{"row": row, "seat": seat} for row, seat in seat_map.taken()]
+
+
+class RoutePathSerializer(serializers.Serializer):
+    distance = serializers.IntegerField()
+    airports = serializers.ListField(child=serializers.IntegerField())
+    routes = serializers.ListField(child=serializers.IntegerField())
+
+
+class ConnectionSerializer(serializers.Serializer):
+    distance = serializers.IntegerField()
+    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    duration_minutes = serializers.IntegerField()
+    layover_minutes = serializers.ListField(
+        child=serializers.IntegerField()
+    )
+    flights = FlightListSerializer(many=True)
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    flight = FlightPrimaryKeyRelatedField()
+
+    def validate(self, attrs):
+        data = super(SeatHoldSerializer, self).validate(attrs=attrs)
+        Ticket.validate_ticket(
+            attrs["row"],
+            attrs["seat"],
+            attrs["flight"].airplane,
+            ValidationError,
+        )
+        return data
+
+    def create(self, validated_data):
+        return SeatHold.objects.hold(**validated_data)
+
+    class Meta:
+        model = SeatHold
+        fields = ("id", "flight", "row", "seat", "expires_at")
+        read_only_fields = ("expires_at",)
+        validators = []
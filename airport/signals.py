@@ -0,0 +1,85 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from airport.caching import invalidate_flight_search
+from airport.conditional import touch_table
+from airport.reference_data import invalidate_reference_data
+from airport.route_graph import record_route_change
+from airport.instrumentation import install_query_recorder
+from airport.slow_queries import install_slow_query_recorder
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Flight,
+    Route,
+    Ticket,
+)
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_flight(sender, instance, **kwargs):
+    instance._previous_flight_id = None
+    if instance.pk:
+        instance._previous_flight_id = Ticket.objects.filter(
+            pk=instance.pk
+        ).values_list("flight_id", flat=True).first()
+
+
+@receiver(post_save, sender=Ticket)
+def take_flight_seat(sender, instance, created, **kwargs):
+    previous_flight_id = getattr(instance, "_previous_flight_id", None)
+    if created:
+        Flight.adjust_tickets_available(instance.flight_id, -1)
+    elif previous_flight_id not in (None, instance.flight_id):
+        Flight.adjust_tickets_available(previous_flight_id, 1)
+        Flight.adjust_tickets_available(instance.flight_id, -1)
+
+
+@receiver(post_delete, sender=Ticket)
+def release_flight_seat(sender, instance, **kwargs):
+    Flight.adjust_tickets_available(instance.flight_id, 1)
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def flight_search_changed(sender, **kwargs):
+    invalidate_flight_search()
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=AirplaneType)
+@receiver(post_delete, sender=AirplaneType)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+def reference_data_changed(sender, **kwargs):
+    invalidate_reference_data()
+    touch_table(sender)
+
+
+@receiver(post_save, sender=Route)
+def route_saved(sender, instance, **kwargs):
+    record_route_change(instance)
+
+
+@receiver(post_delete, sender=Route)
+def route_deleted(sender, instance, **kwargs):
+    record_route_change(instance, deleted=True)
+
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs):
+    install_query_recorder(connection)
+    install_slow_query_recorder(connection)
@@ -0,0 +1,108 @@
+import contextvars
+import json
+import logging
+import os
+import random
+import re
+import time
+import traceback
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+from airport import instrumentation
+
+logger = logging.getLogger("airport.slow_queries")
+
+_explaining = contextvars.ContextVar("explaining_slow_query", default=False)
+
+_SKIPPED_FILES = {
+    os.path.abspath(__file__),
+    os.path.abspath(instrumentation.__file__),
+}
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+def normalize_sql(sql):
+    """Collapse whitespace and ``IN`` lists so equal queries group."""
+    return _IN_LIST.sub("IN (...)", " ".join(sql.split()))
+
+
+def originating_frame():
+    """Innermost stack frame in project code, ex. ``airport/views.py:42``."""
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if (
+            filename.startswith(base_dir)
+            and filename not in _SKIPPED_FILES
+            and "site-packages" not in filename
+        ):
+            path = os.path.relpath(filename, base_dir)
+            return f"{path}:{frame.lineno} in {frame.name}"
+    return None
+
+
+def explain(connection, sql, params):
+    """Run ``EXPLAIN`` for ``sql``; on PostgreSQL with ANALYZE, BUFFERS.
+
+    ANALYZE executes the query once more, which is why it is sampled and
+    limited to SELECTs.
+    """
+    if connection.vendor == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS)"
+    else:
+        prefix = connection.ops.explain_prefix
+
+    token = _explaining.set(True)
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                return "\n".join(
+                    " ".join(str(column) for column in row)
+                    for row in cursor.fetchall()
+                )
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+    finally:
+        _explaining.reset(token)
+
+
+def log_slow_query(connection, sql, params, many, duration):
+    record = {
+        "time": datetime.now(timezone.utc).isoformat(),
+        "alias": connection.alias,
+        "duration_ms": round(duration * 1000, 2),
+        "view": instrumentation.current_view(),
+        "frame": originating_frame(),
+        "sql": sql,
+    }
+    if (
+        not many
+        and sql.lstrip()[:6].upper() == "SELECT"
+        and not connection.needs_rollback
+        and random.random() < settings.SLOW_QUERY["EXPLAIN_SAMPLE_RATE"]
+    ):
+        record["explain"] = explain(connection, sql, params)
+    logger.warning(json.dumps(record))
+
+
+def record_slow_query(execute, sql, params, many, context):
+    """``execute_wrapper`` logging queries over the configured threshold."""
+    threshold = settings.SLOW_QUERY["THRESHOLD_MS"]
+    if not threshold or _explaining.get():
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started
+    if duration * 1000 >= threshold:
+        log_slow_query(context["connection"], sql, params, many, duration)
+    return result
+
+
+def install_slow_query_recorder(connection):
+    if record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_slow_query)
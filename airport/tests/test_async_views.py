@@ -0,0 +1,151 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import Order, Ticket
+from airport.tests.test_airport_api import sample_flight
+from airport.throttling import ScopedThrottle
+
+
+class AsyncFlightViewsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+        self.flights = [sample_flight() for _ in range(3)]
+        order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.user
+        )
+        Ticket.objects.create(
+            row=2, seat=3, flight=self.flights[0], order=order
+        )
+        self.sync_client = APIClient()
+        self.sync_client.force_authenticate(user=self.user)
+
+    async def test_auth_required(self):
+        response = await self.async_client.get(
+            reverse("airport:flight-list-async")
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_flight_list_matches_sync_endpoint(self):
+        url = reverse("airport:flight-list")
+        sync_response = await sync_to_async(self.sync_client.get)(
+            url, {"limit": 2, "route_source": "Test"}
+        )
+
+        response = await self.async_client.get(
+            reverse("airport:flight-list-async"),
+            {"limit": 2, "route_source": "Test"},
+            headers=self.headers,
+        )
+
+        data = response.json()
+        self.assertEqual(data["results"], sync_response.json()["results"])
+        self.assertIn("cursor=", data["next"])
+
+    async def test_flight_list_pages_by_cursor(self):
+        flight = self.flights[0]
+        tied = await sync_to_async(sample_flight)(
+            departure_time=flight.departure_time
+        )
+        earlier = await sync_to_async(sample_flight)(
+            departure_time=flight.departure_time - timedelta(hours=1)
+        )
+
+        ids = []
+        url = reverse("airport:flight-list-async")
+        while url:
+            response = await self.async_client.get(
+                url, {"limit": 2} if not ids else None, headers=self.headers
+            )
+            data = response.json()
+            ids.extend(result["id"] for result in data["results"])
+            url = data["next"]
+
+        self.assertEqual(
+            ids,
+            [earlier.id, *(flight.id for flight in self.flights), tied.id],
+        )
+
+    async def test_invalid_cursor(self):
+        response = await self.async_client.get(
+            reverse("airport:flight-list-async"),
+            {"cursor": "not-a-cursor"},
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    @mock.patch.object(
+        ScopedThrottle, "THROTTLE_RATES", {"flight_search": "2/min"}
+    )
+    async def test_flight_search_throttle(self):
+        for url in (
+            reverse("airport:flight-list-async"),
+            reverse("airport:flight-detail-async", args=[self.flights[0].id]),
+        ):
+            response = await self.async_client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+
+        response = await self.async_client.get(
+            reverse("airport:flight-list-async"), headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    async def test_flight_detail_matches_sync_endpoint(self):
+        flight = self.flights[0]
+        for params in ({}, {"seatmap": "bitmap"}):
+            sync_response = await sync_to_async(self.sync_client.get)(
+                reverse("airport:flight-detail", args=[flight.id]), params
+            )
+
+            response = await self.async_client.get(
+                reverse("airport:flight-detail-async", args=[flight.id]),
+                params,
+                headers=self.headers,
+            )
+
+            self.assertEqual(response.json(), sync_response.json())
+
+    async def test_flight_detail_not_found(self):
+        response = await self.async_client.get(
+            reverse("airport:flight-detail-async", args=[999]),
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_benchmark_command(self):
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_flight_reads",
+            email=self.user.email,
+            requests=4,
+            concurrency=2,
+            stdout=stdout,
+        )
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        for line in lines:
+            self.assertIn("req/s", line)
+            self.assertTrue(line.endswith(" 0 errors"), line)
@@ -0,0 +1,124 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airport.models import Airport
+from airport.tests.test_airport_api import sample_airport, sample_route
+
+AIRPORT_URL = reverse("airport:airport-list")
+ROUTE_URL = reverse("airport:route-list")
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.airport = sample_airport(name="Boryspil", closest_big_city="Kyiv")
+        sample_route(source=self.airport)
+
+    def test_list_sends_validators(self):
+        response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    def test_matching_etag_is_answered_without_queries(self):
+        etag = self.client.get(AIRPORT_URL)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(AIRPORT_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(len(queries), 0)
+
+    def test_if_modified_since_is_answered_with_not_modified(self):
+        last_modified = self.client.get(AIRPORT_URL)["Last-Modified"]
+
+        response = self.client.get(
+            AIRPORT_URL, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(AIRPORT_URL)["ETag"]
+
+        sample_airport(name="Heathrow", closest_big_city="London")
+        created_etag = self.client.get(AIRPORT_URL)["ETag"]
+        Airport.objects.get(name="Heathrow").delete()
+        deleted_etag = self.client.get(AIRPORT_URL)["ETag"]
+
+        self.assertEqual(len({etag, created_etag, deleted_etag}), 3)
+        response = self.client.get(AIRPORT_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_related_table_changes_the_etag(self):
+        etag = self.client.get(ROUTE_URL)["ETag"]
+
+        self.airport.name = "Zhuliany"
+        self.airport.save()
+
+        self.assertNotEqual(self.client.get(ROUTE_URL)["ETag"], etag)
+
+    def test_etag_depends_on_query_string(self):
+        self.assertNotEqual(
+            self.client.get(AIRPORT_URL)["ETag"],
+            self.client.get(AIRPORT_URL, {"name": "Bor"})["ETag"],
+        )
+
+    def test_etag_survives_a_cache_flush(self):
+        etag = self.client.get(AIRPORT_URL)["ETag"]
+        cache.clear()
+        rebuilt = self.client.get(AIRPORT_URL)["ETag"]
+        cache.clear()
+
+        self.assertEqual(self.client.get(AIRPORT_URL)["ETag"], rebuilt)
+        self.assertNotEqual(rebuilt, etag)
+
+    def test_markers_expire_without_an_invalidation(self):
+        etag = self.client.get(AIRPORT_URL)["ETag"]
+        # A change made without signals, as if in another worker's cache.
+        Airport.objects.update(
+            name="Zhuliany", updated_at=timezone.now() + timedelta(seconds=5)
+        )
+
+        self.assertEqual(self.client.get(AIRPORT_URL)["ETag"], etag)
+        with mock.patch("time.time", return_value=time.time() + 61):
+            response = self.client.get(AIRPORT_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_last_modified_does_not_go_back_when_markers_expire(self):
+        heathrow = sample_airport(name="Heathrow", closest_big_city="London")
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=timezone.now() + timedelta(hours=1),
+        ):
+            heathrow.delete()
+        last_modified = self.client.get(AIRPORT_URL)["Last-Modified"]
+
+        with mock.patch("time.time", return_value=time.time() + 61):
+            response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response["Last-Modified"], last_modified)
+        response = self.client.get(
+            AIRPORT_URL, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
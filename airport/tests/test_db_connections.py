@@ -0,0 +1,21 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+
+
+class BenchmarkDbConnectionsTests(TransactionTestCase):
+    def test_reports_each_mode_and_restores_settings(self):
+        conn_max_age = connection.settings_dict["CONN_MAX_AGE"]
+        out = StringIO()
+
+        call_command("benchmark_db_connections", requests=5, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("new connection per request", output)
+        self.assertIn("persistent connection", output)
+        self.assertIn("p95", output)
+        self.assertEqual(
+            connection.settings_dict["CONN_MAX_AGE"], conn_max_age
+        )
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.tests.test_airport_api import sample_flight
+
+FLIGHT_EXPORT_URL = reverse("airport:flight-export")
+TICKET_EXPORT_URL = reverse("airport:ticket-export")
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.flight = sample_flight()
+        self.other_flight = sample_flight()
+        self.order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.admin
+        )
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                row=1, seat=seat, flight=self.flight, order=self.order
+            )
+
+    @staticmethod
+    def content(response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_requires_admin(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(TICKET_EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_ticket_export_ndjson(self):
+        response = self.client.get(
+            TICKET_EXPORT_URL, {"flight": self.flight.id}
+        )
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line)
+            for line in self.content(response).splitlines()
+        ]
+        self.assertEqual([row["seat"] for row in rows], [1, 2, 3])
+        self.assertEqual(rows[0]["order"], self.order.id)
+        self.assertEqual(rows[0]["user"], "admin@test.com")
+
+    def test_flight_export_csv(self):
+        response = self.client.get(
+            FLIGHT_EXPORT_URL,
+            {
+                "output": "csv",
+                "departure_date_from": "2024-12-10",
+                "departure_date_to": "2024-12-10",
+            }
+        )
+
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        self.assertEqual(
+            {row["id"] for row in rows},
+            {str(self.flight.id), str(self.other_flight.id)}
+        )
+        tickets_available = {
+            row["id"]: row["tickets_available"] for row in rows
+        }
+        self.assertEqual(tickets_available[str(self.flight.id)], "37")
+
+    def test_export_unknown_output(self):
+        response = self.client.get(FLIGHT_EXPORT_URL, {"output": "xml"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
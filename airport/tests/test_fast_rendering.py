@@ -0,0 +1,165 @@
+import json
+import os
+import time
+from datetime import datetime
+from decimal import Decimal
+from statistics import median
+from unittest import mock
+
+from django.conf import settings
+from django.db.models import Prefetch
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from airport.converters import row_converter
+from airport.models import Flight, Order, Ticket
+from airport.reference_data import reference_data
+from airport.renderers import FastJSONRenderer
+from airport.serializers import OrderListSerializer, TicketListSerializer
+from airport.tests.test_query_budget import seed_dataset
+
+REPORT_PATH = os.getenv(
+    "AIRPORT_RENDERING_BENCHMARK_REPORT",
+    os.path.join(settings.BASE_DIR, "rendering_benchmark_report.json"),
+)
+TIMING_RUNS = 5
+
+
+class FastJSONRendererTests(TestCase):
+    data = {
+        "name": "Kyiv   Київ",
+        "created_at": make_aware(datetime(2024, 12, 1, 6, 0, 0, 123456)),
+        "price": Decimal("10.50"),
+        1: [None, True, 1.5],
+    }
+
+    def test_output_matches_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data),
+            JSONRenderer().render(self.data),
+        )
+
+    def test_falls_back_to_stdlib_without_orjson(self):
+        with mock.patch("airport.renderers.orjson", None):
+            rendered = FastJSONRenderer().render(self.data)
+
+        self.assertEqual(rendered, JSONRenderer().render(self.data))
+
+    def test_indented_output_uses_stdlib(self):
+        context = {"indent": 2}
+
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, renderer_context=context),
+            JSONRenderer().render(self.data, renderer_context=context),
+        )
+
+
+@override_settings(FLIGHT_SEARCH_CACHE={"ALIAS": "default", "TIMEOUT": 0})
+class FastListRenderingTests(TestCase):
+    """Fast list responses against the serializers on the same dataset.
+
+    The micro-benchmark timings are written to
+    ``AIRPORT_RENDERING_BENCHMARK_REPORT``
+    (``rendering_benchmark_report.json`` by default).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed_dataset()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def assert_same_response(self, url, data=None):
+        with override_settings(FAST_LIST_RENDERING=False):
+            expected = self.client.get(url, data)
+        with override_settings(FAST_LIST_RENDERING=True):
+            response = self.client.get(url, data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+        self.assertTrue(json.loads(response.content)["results"])
+
+    def test_flight_list(self):
+        self.assert_same_response(
+            reverse("airport:flight-list"), {"limit": 50}
+        )
+        self.assert_same_response(
+            reverse("airport:flight-list"),
+            {"limit": 50, "route_source": "City", "departure_time": "2024-12"},
+        )
+
+    def test_ticket_list(self):
+        self.assert_same_response(
+            reverse("airport:ticket-list"), {"limit": 50}
+        )
+
+    def test_order_list(self):
+        self.assert_same_response(
+            reverse("airport:order-list"), {"limit": 50}
+        )
+
+    def test_detail_is_not_affected(self):
+        ticket = Ticket.objects.first()
+        with override_settings(FAST_LIST_RENDERING=True):
+            response = self.client.get(
+                reverse("airport:ticket-detail", args=[ticket.id])
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIsInstance(response.accepted_renderer, FastJSONRenderer)
+
+    def benchmark(self, serializer_class, rows, context):
+        def serializers_path():
+            return JSONRenderer().render(
+                serializer_class(rows, many=True, context=context).data
+            )
+
+        def fast_path():
+            convert = row_converter(serializer_class(context=context))
+            return FastJSONRenderer().render([convert(row) for row in rows])
+
+        self.assertEqual(fast_path(), serializers_path())
+        timings = {}
+        for name, render in (
+            ("serializers", serializers_path),
+            ("fast", fast_path),
+        ):
+            durations = []
+            for _ in range(TIMING_RUNS):
+                started = time.perf_counter()
+                render()
+                durations.append(time.perf_counter() - started)
+            timings[f"{name}_median_ms"] = round(median(durations) * 1000, 2)
+        return timings
+
+    def test_micro_benchmark(self):
+        context = {"reference_data": reference_data()}
+        tickets = list(Ticket.objects.prefetch_related(
+            Prefetch(
+                "flight",
+                queryset=Flight.objects.for_listing(context["reference_data"])
+            )
+        )[:1000])
+        orders = list(Order.objects.filter(user=self.user).history(
+            context["reference_data"]
+        )[:100])
+
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "ticket-list": {
+                "rows": len(tickets),
+                **self.benchmark(TicketListSerializer, tickets, context),
+            },
+            "order-list": {
+                "rows": len(orders),
+                "tickets": sum(len(order.tickets.all()) for order in orders),
+                **self.benchmark(OrderListSerializer, orders, context),
+            },
+        }
+        with open(REPORT_PATH, "w") as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.tests.test_airport_api import (
+    sample_airport,
+    sample_flight,
+    sample_route,
+)
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class FlightSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.kyiv = sample_airport(closest_big_city="Kyiv")
+        self.lviv = sample_airport(closest_big_city="Lviv")
+        self.kyiv_lviv = sample_flight(
+            route=sample_route(source=self.kyiv, destination=self.lviv),
+            departure_time=make_aware(datetime(2024, 12, 10, 23, 30)),
+        )
+        self.lviv_kyiv = sample_flight(
+            route=sample_route(source=self.lviv, destination=self.kyiv),
+            departure_time=make_aware(datetime(2024, 12, 11, 6, 0)),
+        )
+
+    def search(self, **params):
+        response = self.client.get(FLIGHT_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {flight["id"] for flight in response.data["results"]}
+
+    def test_filter_by_airport_ids(self):
+        self.assertEqual(
+            self.search(source=self.kyiv.id), {self.kyiv_lviv.id}
+        )
+        self.assertEqual(
+            self.search(destination=f"{self.kyiv.id},{self.lviv.id}"),
+            {self.kyiv_lviv.id, self.lviv_kyiv.id}
+        )
+
+    def test_filter_by_city_prefix(self):
+        self.assertEqual(self.search(source_city="Lv"), {self.lviv_kyiv.id})
+        self.assertEqual(
+            self.search(destination_city="Lv"), {self.kyiv_lviv.id}
+        )
+
+    def test_filter_by_departure_date_range(self):
+        self.assertEqual(
+            self.search(
+                departure_date_from="2024-12-10",
+                departure_date_to="2024-12-10",
+            ),
+            {self.kyiv_lviv.id}
+        )
+        self.assertEqual(
+            self.search(departure_date_from="2024-12-11"),
+            {self.lviv_kyiv.id}
+        )
+
+    def test_invalid_params(self):
+        for params in (
+            {"source": "kyiv"},
+            {"departure_date_from": "10.12.2024"},
+            {"departure_date_to": "2024-13-40"},
+        ):
+            response = self.client.get(FLIGHT_URL, params)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.tests.test_airport_api import sample_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class FlightSearchCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+
+    def test_repeated_search_is_served_from_cache(self):
+        first = self.client.get(FLIGHT_URL, {"route_source": "Test"})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(FLIGHT_URL, {"route_source": "Test "})
+
+        self.assertEqual(first.data, second.data)
+
+    def test_flight_change_invalidates_cache(self):
+        self.client.get(FLIGHT_URL)
+
+        sample_flight()
+        response = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_ticket_sale_invalidates_cache(self):
+        self.client.get(FLIGHT_URL)
+        order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.user
+        )
+
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=order)
+        response = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(response.data["results"][0]["tickets_available"], 39)
+
+    @override_settings(FLIGHT_SEARCH_CACHE={"ALIAS": "default", "TIMEOUT": 0})
+    def test_cache_disabled(self):
+        self.client.get(FLIGHT_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(FLIGHT_URL)
+
+        self.assertTrue(queries.captured_queries)
@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from airport.models import Flight
+from airport.tests.test_airport_api import (
+    sample_airplane,
+    sample_crew,
+    sample_flight,
+    sample_route,
+)
+
+
+class ImportScheduleTests(TestCase):
+    def setUp(self):
+        self.route = sample_route()
+        self.airplane = sample_airplane()
+        self.crew = [sample_crew(), sample_crew(first_name="Second")]
+
+    def write_schedule(self, extension, content):
+        schedule = tempfile.NamedTemporaryFile(
+            "w", suffix=extension, delete=False
+        )
+        with schedule:
+            schedule.write(content)
+        self.addCleanup(os.remove, schedule.name)
+        return schedule.name
+
+    def import_schedule(self, path, **options):
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            "import_schedule", path, stdout=stdout, stderr=stderr, **options
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_csv(self):
+        crew_ids = ";".join(str(crew.id) for crew in self.crew)
+        rows = [
+            "route,airplane,departure_time,arrival_time,crew",
+            *(
+                f"{self.route.id},{self.airplane.id},"
+                f"2025-01-{day:02} 10:00,2025-01-{day:02} 14:00,{crew_ids}"
+                for day in range(1, 11)
+            ),
+            f"{self.route.id},{self.airplane.id},"
+            f"2025-01-01 10:00,2025-01-01 14:00,",
+            f"999,{self.airplane.id},2025-01-01 10:00,2025-01-01 14:00,",
+        ]
+        path = self.write_schedule(".csv", "\n".join(rows))
+
+        stdout, stderr = self.import_schedule(path, batch_size=4)
+
+        self.assertEqual(Flight.objects.count(), 10)
+        self.assertEqual(Flight.crew.through.objects.count(), 20)
+        self.assertEqual(
+            set(Flight.objects.values_list("tickets_available", flat=True)),
+            {self.airplane.capacity}
+        )
+        self.assertIn("created 10 flights", stdout)
+        self.assertIn("skipped 1 duplicates and 1 invalid rows", stdout)
+        self.assertIn("unknown route 999", stderr)
+
+    def test_import_repeated_crew_member(self):
+        crew_id = self.crew[0].id
+        path = self.write_schedule(".csv", "\n".join([
+            "route,airplane,departure_time,arrival_time,crew",
+            f"{self.route.id},{self.airplane.id},"
+            f"2025-01-01 10:00,2025-01-01 14:00,{crew_id};{crew_id}",
+        ]))
+
+        stdout, _ = self.import_schedule(path)
+
+        self.assertIn("created 1 flights", stdout)
+        self.assertEqual(
+            list(Flight.objects.get().crew.all()), [self.crew[0]]
+        )
+
+    def test_import_json_skips_existing_flights(self):
+        existing = sample_flight(route=self.route, airplane=self.airplane)
+        rows = [
+            {
+                "route": self.route.id,
+                "airplane": self.airplane.id,
+                "departure_time": existing.departure_time.isoformat(),
+                "arrival_time": existing.arrival_time.isoformat(),
+            },
+            {
+                "route": self.route.id,
+                "airplane": self.airplane.id,
+                "departure_time": "2025-02-01T08:00:00Z",
+                "arrival_time": "2025-02-01T11:00:00Z",
+                "crew": [self.crew[0].id],
+            },
+        ]
+        path = self.write_schedule(".json", json.dumps(rows))
+
+        stdout, _ = self.import_schedule(path)
+
+        self.assertEqual(Flight.objects.count(), 2)
+        self.assertIn("skipped 1 duplicates", stdout)
@@ -0,0 +1,135 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.instrumentation import REGISTRY, MetricsRegistry
+from airport.tests.test_airport_api import sample_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+METRICS_URL = reverse("metrics")
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        REGISTRY.reset()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        sample_flight()
+
+    def test_logs_view_queries_and_timings(self):
+        with self.assertLogs("airport.requests") as logs:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(FLIGHT_URL)
+
+        self.assertEqual(len(logs.records), 1)
+        message = logs.output[0]
+        self.assertIn('"view": "FlightViewSet.list"', message)
+        self.assertIn(f'"db_queries": {len(queries)}', message)
+        self.assertIn('"render_ms"', message)
+        log = json.loads(logs.records[0].getMessage())
+        self.assertGreater(log["serialize_ms"], 0)
+        self.assertLessEqual(log["serialize_ms"], log["view_ms"])
+
+    @override_settings(FAST_LIST_RENDERING=True)
+    def test_fast_list_conversion_counts_as_serialization(self):
+        with self.assertLogs("airport.requests") as logs:
+            self.client.get(FLIGHT_URL)
+
+        log = json.loads(logs.records[0].getMessage())
+        self.assertGreater(log["serialize_ms"], 0)
+
+    async def test_async_views_are_measured(self):
+        with self.assertLogs("airport.requests") as logs:
+            await self.async_client.get(
+                reverse("airport:flight-list-async"),
+                headers={
+                    "Authorization":
+                        f"Bearer {AccessToken.for_user(self.user)}"
+                },
+            )
+
+        self.assertIn('"view": "flight_list"', logs.output[0])
+        self.assertNotIn('"db_queries": 0', logs.output[0])
+
+    def test_metrics_endpoint_exposes_histograms(self):
+        self.client.get(FLIGHT_URL)
+        self.client.get(FLIGHT_URL)
+
+        response = self.client.get(METRICS_URL)
+
+        body = response.content.decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'airport_requests_total{view="FlightViewSet.list",'
+            'method="GET",status="200"} 2',
+            body,
+        )
+        self.assertIn(
+            'airport_request_duration_seconds_count'
+            '{view="FlightViewSet.list",method="GET"} 2',
+            body,
+        )
+        self.assertIn("# TYPE airport_request_db_queries histogram", body)
+
+    def test_metrics_of_all_workers_are_summed(self):
+        other_worker = MetricsRegistry()
+        other_worker.count("FlightViewSet.list", "GET", 200)
+        other_worker.flush(force=True)
+
+        self.client.get(FLIGHT_URL)
+        body = self.client.get(METRICS_URL).content.decode()
+
+        self.assertIn(
+            'airport_requests_total{view="FlightViewSet.list",'
+            'method="GET",status="200"} 2',
+            body,
+        )
+
+    @override_settings(
+        REQUEST_METRICS={"SAMPLE_RATE": 0.0, "TOKEN": None, "PUBLIC": True}
+    )
+    def test_unsampled_requests_are_only_counted(self):
+        with self.assertNoLogs("airport.requests"):
+            self.client.get(FLIGHT_URL)
+
+        body = self.client.get(METRICS_URL).content.decode()
+        self.assertIn('view="FlightViewSet.list"', body)
+        self.assertNotIn("airport_request_duration_seconds_count", body)
+
+    @override_settings(
+        REQUEST_METRICS={
+            "SAMPLE_RATE": 1.0, "TOKEN": "scrape", "PUBLIC": False
+        }
+    )
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+        response = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION="Bearer scrape"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(
+        REQUEST_METRICS={"SAMPLE_RATE": 1.0, "TOKEN": None, "PUBLIC": False}
+    )
+    def test_metrics_are_staff_only_without_token_in_production(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
@@ -0,0 +1,144 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.filters import filter_queryset, lookup_spans_to_many
+from airport.models import Airport, Flight, Order, Ticket
+from airport.tests.test_airport_api import sample_flight
+
+
+class LookupSpansToManyTests(TestCase):
+    def test_to_one_lookups(self):
+        for lookup in (
+            "departure_time__icontains",
+            "route__source_id__in",
+            "route__destination__closest_big_city__startswith",
+            "airplane__airplane_type__name",
+        ):
+            self.assertFalse(lookup_spans_to_many(Flight, lookup), lookup)
+
+    def test_to_many_lookups(self):
+        for model, lookup in (
+            (Flight, "crew__first_name"),
+            (Flight, "tickets__order"),
+            (Airport, "routes_as_source__distance__gte"),
+        ):
+            self.assertTrue(lookup_spans_to_many(model, lookup), lookup)
+
+    def test_filter_queryset_adds_distinct_only_for_fan_out(self):
+        self.assertFalse(
+            filter_queryset(Flight.objects.all(), route_id=1).query.distinct
+        )
+        self.assertTrue(
+            filter_queryset(
+                Flight.objects.all(), crew__last_name="Test"
+            ).query.distinct
+        )
+
+
+class ListQueryPlanTests(TestCase):
+    """The generated SQL of the list endpoints must not use DISTINCT."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        flight = sample_flight()
+        order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.user
+        )
+        Ticket.objects.create(row=1, seat=1, flight=flight, order=order)
+        self.order = order
+
+    def assert_no_distinct(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, 200)
+        select_queries = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertTrue(select_queries)
+        for sql in select_queries:
+            self.assertNotIn("DISTINCT", sql.upper())
+        return select_queries
+
+    def test_airport_list(self):
+        self.assert_no_distinct(
+            reverse("airport:airport-list"), {"closest_big_city": "Test"}
+        )
+
+    def test_flight_list(self):
+        queries = self.assert_no_distinct(
+            reverse("airport:flight-list"),
+            {
+                "route_source": "Test",
+                "route_destination": "Test",
+                "departure_date_from": "2024-12-10",
+            }
+        )
+        for sql in queries:
+            self.assertNotIn("GROUP BY", sql.upper())
+            self.assertNotIn("airport_crew", sql)
+
+    def test_ticket_list(self):
+        self.assert_no_distinct(
+            reverse("airport:ticket-list"), {"order": self.order.id}
+        )
+
+    def test_order_list(self):
+        self.assert_no_distinct(reverse("airport:order-list"))
+
+
+class ListReadPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.user
+        )
+        for seat in range(1, 6):
+            Ticket.objects.create(
+                row=1, seat=seat, flight=sample_flight(), order=order
+            )
+
+    def test_ticket_list_without_model_str(self):
+        with mock.patch.object(
+            Airport, "__str__", side_effect=AssertionError
+        ), self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("airport:ticket-list"), {"limit": 5, "count": "false"}
+            )
+
+        flight = response.data["results"][0]["flight"]
+        self.assertEqual(
+            flight["route_source"], "Test City: airport Test Airport"
+        )
+        self.assertEqual(flight["airplane"], "Test Airplane")
+        self.assertEqual(flight["tickets_available"], 39)
+
+    def test_flight_list_without_model_str(self):
+        with mock.patch.object(
+            Airport, "__str__", side_effect=AssertionError
+        ), self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("airport:flight-list"), {"limit": 5, "count": "false"}
+            )
+
+        self.assertEqual(len(response.data["results"]), 5)
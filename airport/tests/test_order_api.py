@@ -0,0 +1,170 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.tests.test_airport_api import sample_flight
+
+ORDER_URL = reverse("airport:order-list")
+
+
+class OrderCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+
+    def order_payload(self, seats, flight=None):
+        flight = flight or self.flight
+        return {
+            "created_at": "2024-12-01 10:00:00",
+            "tickets": [
+                {"row": row, "seat": seat, "flight": flight.id}
+                for row, seat in seats
+            ],
+        }
+
+    def test_create_order_with_tickets(self):
+        seats = [(row, seat) for row in range(1, 6) for seat in range(1, 9)]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                ORDER_URL, self.order_payload(seats), format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.filter(flight=self.flight).count(), 40)
+        self.assertLess(len(queries), 10)
+
+    def test_create_order_with_taken_seat(self):
+        order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.user
+        )
+        Ticket.objects.create(row=1, seat=2, flight=self.flight, order=order)
+
+        response = self.client.post(
+            ORDER_URL,
+            self.order_payload([(1, 1), (1, 2)]),
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["tickets"][0], {})
+        self.assertIn("non_field_errors", response.data["tickets"][1])
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_create_order_with_duplicate_seats(self):
+        response = self.client.post(
+            ORDER_URL,
+            self.order_payload([(2, 2), (2, 2)]),
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data["tickets"][1])
+
+    def test_create_order_with_seat_out_of_range(self):
+        response = self.client.post(
+            ORDER_URL,
+            self.order_payload([(1, 1), (6, 1)]),
+            format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", response.data["tickets"][1])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_create_order_with_malformed_flight(self):
+        payload = self.order_payload([(1, 1), (1, 2)])
+        payload["tickets"][1]["flight"] = [self.flight.id]
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["tickets"][0], {})
+        self.assertEqual(
+            response.data["tickets"][1]["flight"][0].code, "incorrect_type"
+        )
+        self.assertFalse(Ticket.objects.exists())
+
+
+class OrderHistoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        other_user = get_user_model().objects.create_user(
+            email="other@test.com",
+            password="<PASSWORD>"
+        )
+        flights = [
+            sample_flight(),
+            sample_flight(
+                departure_time=make_aware(datetime(2024, 12, 11, 11, 0)),
+                arrival_time=make_aware(datetime(2024, 12, 11, 19, 0)),
+            ),
+        ]
+        for day in range(1, 11):
+            order = Order.objects.create(
+                created_at=make_aware(datetime(2024, 12, day, 10, 0)),
+                user=self.user,
+            )
+            for seat, flight in enumerate(flights, start=day % 2 * 2 + 1):
+                Ticket.objects.create(
+                    row=(day + 1) // 2, seat=seat, flight=flight, order=order
+                )
+        Order.objects.create(
+            created_at=make_aware(datetime(2024, 12, 5, 10, 0)),
+            user=other_user,
+        )
+
+    def test_page_is_loaded_in_fixed_number_of_queries(self):
+        for limit in (2, 10):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    ORDER_URL, {"limit": limit, "count": "false"}
+                )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), limit)
+            self.assertEqual(len(queries), 3)
+
+        ticket = response.data["results"][0]["tickets"][0]
+        self.assertEqual(ticket["row"], 1)
+        self.assertEqual(
+            ticket["flight"]["route_source"], "Test City: airport Test Airport"
+        )
+        self.assertEqual(ticket["flight"]["airplane"], "Test Airplane")
+
+    def test_filter_by_created_date_range(self):
+        response = self.client.get(
+            ORDER_URL,
+            {"created_date_from": "2024-12-03", "created_date_to": "2024-12-05"},
+        )
+
+        self.assertEqual(
+            [order["created_at"] for order in response.data["results"]],
+            ["2024-12-03 10:00", "2024-12-04 10:00", "2024-12-05 10:00"],
+        )
+
+    def test_invalid_created_date(self):
+        response = self.client.get(ORDER_URL, {"created_date_from": "12/03"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("created_date_from", response.data)
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.test import APIClient
+
+from airport.tests.test_airport_api import sample_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        start = make_aware(datetime(2024, 12, 10, 11, 0))
+        self.flights = [
+            sample_flight(departure_time=start + timedelta(hours=hours % 4))
+            for hours in range(12)
+        ]
+
+    def test_pages_follow_departure_time_and_id(self):
+        ids = []
+        url = FLIGHT_URL
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.data["count"], 12)
+            ids.extend(flight["id"] for flight in response.data["results"])
+            url = response.data["next"]
+
+        expected = sorted(
+            self.flights, key=lambda flight: (flight.departure_time, flight.id)
+        )
+        self.assertEqual(ids, [flight.id for flight in expected])
+
+    def test_count_can_be_skipped(self):
+        response = self.client.get(FLIGHT_URL, {"count": "false", "limit": 3})
+
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_offset_requests_keep_offset_pages(self):
+        expected = sorted(
+            self.flights, key=lambda flight: (flight.departure_time, flight.id)
+        )
+
+        response = self.client.get(FLIGHT_URL, {"offset": 4, "limit": 3})
+
+        self.assertEqual(response.data["count"], 12)
+        self.assertEqual(
+            [flight["id"] for flight in response.data["results"]],
+            [flight.id for flight in expected[4:7]],
+        )
+        self.assertIn("offset=7", response.data["next"])
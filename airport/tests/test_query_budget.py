@@ -0,0 +1,348 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from statistics import median
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+REPORT_PATH = os.getenv(
+    "AIRPORT_BENCHMARK_REPORT",
+    os.path.join(settings.BASE_DIR, "benchmark_report.json"),
+)
+TIMING_RUNS = 3
+PAGE = {"limit": 50}
+
+AIRPORTS = 20
+FLIGHTS = 300
+TICKETS_PER_FLIGHT = 10
+ORDERS = 200
+
+
+def seed_dataset():
+    airports = Airport.objects.bulk_create(
+        Airport(name=f"Airport {i}", closest_big_city=f"City {i}")
+        for i in range(AIRPORTS)
+    )
+    routes = Route.objects.bulk_create(
+        Route(
+            source=source,
+            destination=destination,
+            distance=100 + i,
+        )
+        for i, (source, destination) in enumerate(
+            (source, destination)
+            for source in airports
+            for destination in airports[:3]
+            if source != destination
+        )
+    )
+    airplane_types = AirplaneType.objects.bulk_create(
+        AirplaneType(name=f"Type {i}") for i in range(5)
+    )
+    airplanes = Airplane.objects.bulk_create(
+        Airplane(
+            name=f"Airplane {i}",
+            rows=30,
+            seats_in_row=6,
+            airplane_type=airplane_types[i % len(airplane_types)],
+        )
+        for i in range(20)
+    )
+    crews = Crew.objects.bulk_create(
+        Crew(first_name=f"First {i}", last_name=f"Last {i}")
+        for i in range(30)
+    )
+
+    start = make_aware(datetime(2024, 12, 1, 6, 0))
+    flights = Flight.objects.bulk_create(
+        Flight(
+            route=routes[i % len(routes)],
+            airplane=airplanes[i % len(airplanes)],
+            departure_time=start + timedelta(hours=i),
+            arrival_time=start + timedelta(hours=i + 3),
+            tickets_available=30 * 6 - TICKETS_PER_FLIGHT,
+        )
+        for i in range(FLIGHTS)
+    )
+    Flight.crew.through.objects.bulk_create(
+        Flight.crew.through(flight=flight, crew=crews[(i + j) % len(crews)])
+        for i, flight in enumerate(flights)
+        for j in range(3)
+    )
+
+    users = [
+        get_user_model().objects.create_user(
+            email=f"user{i}@test.com", password="<PASSWORD>"
+        )
+        for i in range(2)
+    ]
+    orders = Order.objects.bulk_create(
+        Order(created_at=start, user=users[i % len(users)])
+        for i in range(ORDERS)
+    )
+    Ticket.objects.bulk_create(
+        Ticket(
+            row=seat // 6 + 1,
+            seat=seat % 6 + 1,
+            flight=flight,
+            order=orders[(i * TICKETS_PER_FLIGHT + seat) % len(orders)],
+        )
+        for i, flight in enumerate(flights)
+        for seat in range(TICKETS_PER_FLIGHT)
+    )
+    return users[0]
+
+
+class QueryBudgetTests(TestCase):
+    """Fixed query budgets and timings for every router endpoint.
+
+    Each request runs against a few hundred flights and a few thousand
+    tickets with a page of 50 rows, so an N+1 query shows up as a budget
+    overrun. The cache is cleared before every request, so the catalog
+    endpoints also pay the one query that rebuilds their change markers,
+    and the keyset-paginated lists the ``COUNT(*)`` they send by default.
+    Timings are written to ``AIRPORT_BENCHMARK_REPORT``
+    (``benchmark_report.json`` by default) to compare across commits.
+    """
+
+    timings = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed_dataset()
+        cls.admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="<PASSWORD>"
+        )
+        cls.flight = Flight.objects.first()
+        cls.ticket = Ticket.objects.first()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "dataset": {
+                "flights": FLIGHTS,
+                "tickets": FLIGHTS * TICKETS_PER_FLIGHT,
+                "orders": ORDERS,
+            },
+            "endpoints": cls.timings,
+        }
+        with open(REPORT_PATH, "w") as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def assert_budget(
+            self,
+            name,
+            url,
+            max_queries,
+            data=None,
+            method="get",
+            status=200,
+            runs=TIMING_RUNS,
+    ):
+        durations = []
+        for _ in range(runs):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                if method == "post":
+                    response = self.client.post(url, data, format="json")
+                else:
+                    response = self.client.get(url, data)
+                durations.append(time.perf_counter() - started)
+
+            self.assertEqual(response.status_code, status, name)
+            self.assertLessEqual(
+                len(queries),
+                max_queries,
+                f"{name}: {len(queries)} queries, budget {max_queries}",
+            )
+
+        self.timings[name] = {
+            "queries": len(queries),
+            "budget": max_queries,
+            "median_ms": round(median(durations) * 1000, 2),
+        }
+
+    def test_crews(self):
+        self.assert_budget("crew-list", reverse("airport:crew-list"), 2, PAGE)
+        self.assert_budget(
+            "crew-detail",
+            reverse("airport:crew-detail", args=[Crew.objects.first().id]),
+            1,
+        )
+
+    def test_airports(self):
+        self.assert_budget(
+            "airport-list", reverse("airport:airport-list"), 3, PAGE
+        )
+        self.assert_budget(
+            "airport-detail",
+            reverse(
+                "airport:airport-detail", args=[Airport.objects.first().id]
+            ),
+            2,
+        )
+
+    def test_routes(self):
+        self.assert_budget("route-list", reverse("airport:route-list"), 3, PAGE)
+        self.assert_budget(
+            "route-detail",
+            reverse("airport:route-detail", args=[Route.objects.first().id]),
+            2,
+        )
+
+    def test_airplane_types(self):
+        self.assert_budget(
+            "airplane-type-list", reverse("airport:airplanetype-list"), 3, PAGE
+        )
+        self.assert_budget(
+            "airplane-type-detail",
+            reverse(
+                "airport:airplanetype-detail",
+                args=[AirplaneType.objects.first().id],
+            ),
+            2,
+        )
+
+    def test_airplanes(self):
+        self.assert_budget(
+            "airplane-list", reverse("airport:airplane-list"), 3, PAGE
+        )
+        self.assert_budget(
+            "airplane-detail",
+            reverse(
+                "airport:airplane-detail", args=[Airplane.objects.first().id]
+            ),
+            2,
+        )
+
+    def test_flights(self):
+        self.assert_budget(
+            "flight-list", reverse("airport:flight-list"), 2, PAGE
+        )
+        self.assert_budget(
+            "flight-search",
+            reverse("airport:flight-list"),
+            2,
+            {**PAGE, "route_source": "City", "departure_time": "2024-12"},
+        )
+        self.assert_budget(
+            "flight-detail",
+            reverse("airport:flight-detail", args=[self.flight.id]),
+            4,
+        )
+        self.assert_budget(
+            "flight-detail-bitmap",
+            reverse("airport:flight-detail", args=[self.flight.id]),
+            4,
+            {"seatmap": "bitmap"},
+        )
+
+    def test_tickets(self):
+        self.assert_budget(
+            "ticket-list", reverse("airport:ticket-list"), 3, PAGE
+        )
+        self.assert_budget(
+            "ticket-detail",
+            reverse("airport:ticket-detail", args=[self.ticket.id]),
+            2,
+        )
+
+    def test_orders(self):
+        self.assert_budget(
+            "order-list", reverse("airport:order-list"), 4, PAGE
+        )
+
+    def test_order_create(self):
+        seats = [(row, seat) for row in range(10, 20) for seat in range(1, 7)]
+        self.assert_budget(
+            "order-create",
+            reverse("airport:order-list"),
+            9,
+            {
+                "created_at": "2024-12-01 10:00:00",
+                "tickets": [
+                    {"row": row, "seat": seat, "flight": self.flight.id}
+                    for row, seat in seats
+                ],
+            },
+            method="post",
+            status=201,
+            runs=1,
+        )
+        self.assertEqual(
+            Ticket.objects.filter(flight=self.flight).count(),
+            TICKETS_PER_FLIGHT + len(seats),
+        )
+
+    def test_user_endpoints(self):
+        self.assert_budget("user-me", reverse("user:manage"), 0)
+
+        self.client.force_authenticate(user=None)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.assert_budget("user-me-jwt", reverse("user:manage"), 1)
+        self.client.credentials()
+
+        self.assert_budget(
+            "user-register",
+            reverse("user:create"),
+            2,
+            {"email": "new@test.com", "password": "<PASSWORD>"},
+            method="post",
+            status=201,
+            runs=1,
+        )
+        self.assert_budget(
+            "user-token",
+            reverse("user:token_obtain_pair"),
+            1,
+            {"email": "admin@test.com", "password": "<PASSWORD>"},
+            method="post",
+        )
+        refresh = self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"email": "admin@test.com", "password": "<PASSWORD>"},
+        ).data["refresh"]
+        self.assert_budget(
+            "user-token-refresh",
+            reverse("user:token_refresh"),
+            0,
+            {"refresh": refresh},
+            method="post",
+        )
+        self.assert_budget(
+            "user-token-verify",
+            reverse("user:token_verify"),
+            0,
+            {"token": refresh},
+            method="post",
+        )
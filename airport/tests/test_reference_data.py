@@ -0,0 +1,124 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Airport
+from airport.reference_data import reference_data
+from airport.tests.test_airport_api import (
+    sample_airport,
+    sample_flight,
+    sample_route,
+)
+
+AIRPORT_URL = reverse("airport:airport-list")
+FLIGHT_URL = reverse("airport:flight-list")
+ROUTE_URL = reverse("airport:route-list")
+
+
+@override_settings(FLIGHT_SEARCH_CACHE={"ALIAS": "default", "TIMEOUT": 0})
+class ReferenceDataTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight(
+            route=sample_route(
+                source=sample_airport(
+                    name="Boryspil", closest_big_city="Kyiv"
+                ),
+                destination=sample_airport(
+                    name="Heathrow", closest_big_city="London"
+                ),
+            )
+        )
+
+    def test_flight_list_resolves_display_fields_without_joins(self):
+        self.client.get(FLIGHT_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(FLIGHT_URL, {"count": "false"})
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("JOIN", queries[0]["sql"])
+        flight = response.data["results"][0]
+        self.assertEqual(flight["route_source"], "Kyiv: airport Boryspil")
+        self.assertEqual(
+            flight["route_destination"], "London: airport Heathrow"
+        )
+        self.assertEqual(flight["airplane"], "Test Airplane")
+
+    def test_saving_reference_rows_reloads_the_snapshot(self):
+        self.client.get(FLIGHT_URL)
+
+        airport = Airport.objects.get(name="Boryspil")
+        airport.name = "Zhuliany"
+        airport.save()
+
+        response = self.client.get(FLIGHT_URL)
+        self.assertEqual(
+            response.data["results"][0]["route_source"],
+            "Kyiv: airport Zhuliany",
+        )
+
+    def test_airport_list_is_served_from_memory(self):
+        self.client.get(AIRPORT_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                AIRPORT_URL, {"closest_big_city": "lon"}
+            )
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["name"], "Heathrow")
+
+    def test_route_list_matches_joined_list(self):
+        expected = {
+            "id": self.flight.route_id,
+            "source_city": "Kyiv",
+            "destination_city": "London",
+            "distance": 100,
+        }
+
+        response = self.client.get(ROUTE_URL)
+
+        self.assertEqual(dict(response.data["results"][0]), expected)
+
+    @override_settings(
+        REFERENCE_DATA={"ALIAS": "default", "MAX_ROWS": 1, "TIMEOUT": 300}
+    )
+    def test_tables_over_max_rows_are_joined(self):
+        self.assertIsNone(reference_data())
+
+        response = self.client.get(FLIGHT_URL)
+        self.assertEqual(
+            response.data["results"][0]["route_source"],
+            "Kyiv: airport Boryspil",
+        )
+
+    def test_snapshot_expires_without_an_invalidation(self):
+        snapshot = reference_data()
+        # A change made by another worker that never reached this cache.
+        Airport.objects.filter(name="Boryspil").update(name="Zhuliany")
+
+        self.assertIs(reference_data(), snapshot)
+        with mock.patch("time.time", return_value=time.time() + 301):
+            reloaded = reference_data()
+
+        self.assertIsNot(reloaded, snapshot)
+        self.assertIn(("Zhuliany", "Kyiv"), reloaded.airports.values())
+
+    def test_not_used_inside_a_transaction(self):
+        self.assertIsNotNone(reference_data())
+        with transaction.atomic():
+            self.assertIsNone(reference_data())
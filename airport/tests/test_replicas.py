@@ -0,0 +1,115 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Airport, Crew, Order
+from airport.replicas import (
+    ReplicaRouter,
+    read_from_primary,
+    read_from_replica,
+)
+from airport.tests.test_airport_api import sample_flight
+
+AIRPORT_URL = reverse("airport:airport-list")
+CREW_URL = reverse("airport:crew-list")
+FLIGHT_EXPORT_URL = reverse("airport:flight-export")
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+REPLICA = "replica_stand_in"
+
+
+@skipUnless(
+    REPLICA in settings.DATABASES,
+    "run with --settings=airport_service.test_settings",
+)
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {"default", REPLICA}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_catalog_reads_use_the_replica(self):
+        Crew.objects.create(first_name="Primary", last_name="Crew")
+        Crew.objects.using(REPLICA).create(
+            first_name="Replica", last_name="Crew"
+        )
+
+        response = self.client.get(CREW_URL)
+
+        names = [crew["first_name"] for crew in response.data["results"]]
+        self.assertEqual(names, ["Replica"])
+
+    def test_catalog_writes_use_the_primary(self):
+        response = self.client.post(
+            AIRPORT_URL, {"name": "New", "closest_big_city": "Odesa"}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Airport.objects.filter(name="New").exists())
+        self.assertFalse(
+            Airport.objects.using(REPLICA).filter(name="New").exists()
+        )
+
+    def test_conditional_responses_read_from_the_primary(self):
+        airport = Airport.objects.create(
+            name="Primary", closest_big_city="Odesa"
+        )
+
+        response = self.client.get(
+            reverse("airport:airport-detail", args=[airport.id])
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+
+    @override_settings(FLIGHT_SEARCH_CACHE={"ALIAS": "default", "TIMEOUT": 60})
+    def test_flight_search_cache_is_filled_from_the_primary(self):
+        sample_flight()
+
+        response = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_streamed_exports_read_from_the_replica(self):
+        with CaptureQueriesContext(connections[REPLICA]) as queries:
+            response = self.client.get(FLIGHT_EXPORT_URL)
+            b"".join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            any("airport_flight" in query["sql"] for query in queries)
+        )
+
+    def test_orders_read_from_the_primary(self):
+        Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.admin
+        )
+
+        response = self.client.get(ORDER_URL)
+
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_open_transaction_reads_from_the_primary(self):
+        router = ReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(Airport))
+        with read_from_replica():
+            self.assertEqual(router.db_for_read(Airport), REPLICA)
+            with transaction.atomic():
+                self.assertIsNone(router.db_for_read(Airport))
+            with read_from_primary():
+                self.assertIsNone(router.db_for_read(Airport))
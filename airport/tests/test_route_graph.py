@@ -0,0 +1,271 @@
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils.timezone import make_aware
+from rest_framework.test import APIClient
+
+from airport.management.commands.benchmark_route_graph import (
+    synthetic_routes,
+)
+from airport.models import Route
+from airport.route_graph import RouteGraph, route_graph
+from airport.tests.test_airport_api import (
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+)
+
+SHORTEST_URL = reverse("airport:route-shortest")
+CONNECTIONS_URL = reverse("airport:flight-connections")
+
+
+def build_graph(routes):
+    graph = RouteGraph(version=0)
+    for route in routes:
+        graph.put_route(*route)
+    return graph
+
+
+class RouteGraphTests(SimpleTestCase):
+    # 1 -> 2 -> 3 -> 4 is shorter than 1 -> 4 and 1 -> 3 -> 4.
+    routes = [
+        (1, 1, 2, 100),
+        (2, 2, 3, 100),
+        (3, 3, 4, 100),
+        (4, 1, 4, 500),
+        (5, 1, 3, 250),
+        (6, 4, 1, 10),
+    ]
+
+    def test_shortest_path(self):
+        graph = build_graph(self.routes)
+
+        self.assertEqual(
+            graph.shortest_path(1, 4), (300, (1, 2, 3, 4), (1, 2, 3))
+        )
+        self.assertEqual(
+            graph.shortest_path(1, 4, max_legs=2), (350, (1, 3, 4), (5, 3))
+        )
+        self.assertIsNone(build_graph(self.routes[:3]).shortest_path(4, 1))
+
+    def test_k_shortest_paths(self):
+        paths = build_graph(self.routes).k_shortest_paths(1, 4, 5)
+
+        self.assertEqual(
+            [(distance, airports) for distance, airports, _ in paths],
+            [(300, (1, 2, 3, 4)), (350, (1, 3, 4)), (500, (1, 4))],
+        )
+        self.assertEqual(
+            [
+                airports for _, airports, _ in
+                build_graph(self.routes).k_shortest_paths(1, 4, 5, 2)
+            ],
+            [(1, 3, 4), (1, 4)],
+        )
+
+    def test_a_star_matches_dijkstra(self):
+        routes = synthetic_routes(300, 3, seed=2)
+        graph = build_graph(routes)
+
+        for source, target in [(0, 299), (17, 250), (120, 3), (42, 43)]:
+            self.assertEqual(
+                graph.shortest_path(source, target)[0],
+                graph.shortest_path(source, target, use_landmarks=False)[0],
+            )
+
+    def test_changes_are_applied_to_a_copy(self):
+        graph = build_graph(self.routes)
+        graph.landmarks
+
+        changed = graph.with_changes(1, [
+            (2, None),
+            (7, (2, 4, 120)),
+            (5, (1, 3, 50)),
+        ])
+
+        self.assertEqual(graph.shortest_path(1, 4)[0], 300)
+        self.assertEqual(changed.shortest_path(1, 4), (150, (1, 3, 4), (5, 3)))
+        expected = build_graph([
+            (1, 1, 2, 100),
+            (3, 3, 4, 100),
+            (4, 1, 4, 500),
+            (5, 1, 3, 50),
+            (6, 4, 1, 10),
+            (7, 2, 4, 120),
+        ])
+        self.assertEqual(changed.adjacency, expected.adjacency)
+        self.assertEqual(changed.reverse, expected.reverse)
+
+    def test_parallel_routes_use_the_shortest(self):
+        graph = build_graph([(1, 1, 2, 300), (2, 1, 2, 200)])
+
+        self.assertEqual(graph.shortest_path(1, 2), (200, (1, 2), (2,)))
+        graph = graph.with_changes(1, [(2, None)])
+        self.assertEqual(graph.shortest_path(1, 2), (300, (1, 2), (1,)))
+
+
+class RouteGraphJournalTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.kyiv = sample_airport(closest_big_city="Kyiv")
+        self.london = sample_airport(closest_big_city="London")
+
+    def test_route_changes_are_replayed(self):
+        graph = route_graph()
+        self.assertIsNone(graph.shortest_path(self.kyiv.id, self.london.id))
+
+        with mock.patch.object(
+            RouteGraph, "load", side_effect=AssertionError
+        ):
+            route = sample_route(
+                source=self.kyiv, destination=self.london, distance=2100
+            )
+            self.assertEqual(
+                route_graph().shortest_path(self.kyiv.id, self.london.id)[0],
+                2100,
+            )
+            route.delete()
+            self.assertIsNone(
+                route_graph().shortest_path(self.kyiv.id, self.london.id)
+            )
+
+    def test_flushed_journal_reloads_the_graph(self):
+        route_graph()
+        Route.objects.create(
+            source=self.kyiv, destination=self.london, distance=2100
+        )
+        cache.clear()
+
+        self.assertEqual(
+            route_graph().shortest_path(self.kyiv.id, self.london.id)[0],
+            2100,
+        )
+
+
+class RouteGraphApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.kyiv = sample_airport(closest_big_city="Kyiv")
+        self.warsaw = sample_airport(closest_big_city="Warsaw")
+        self.london = sample_airport(closest_big_city="London")
+        self.via_warsaw = (
+            sample_route(
+                source=self.kyiv, destination=self.warsaw, distance=700
+            ),
+            sample_route(
+                source=self.warsaw, destination=self.london, distance=1400
+            ),
+        )
+        self.direct = sample_route(
+            source=self.kyiv, destination=self.london, distance=2200
+        )
+
+    def test_shortest_paths(self):
+        response = self.client.get(SHORTEST_URL, {
+            "source": self.kyiv.id, "destination": self.london.id, "k": 2,
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [
+            {
+                "distance": 2100,
+                "airports": [self.kyiv.id, self.warsaw.id, self.london.id],
+                "routes": [route.id for route in self.via_warsaw],
+            },
+            {
+                "distance": 2200,
+                "airports": [self.kyiv.id, self.london.id],
+                "routes": [self.direct.id],
+            },
+        ])
+
+    def test_invalid_params(self):
+        response = self.client.get(
+            SHORTEST_URL, {"source": "kyiv", "destination": 2, "k": 50}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("source", response.data)
+
+    def test_max_legs_is_capped(self):
+        response = self.client.get(
+            SHORTEST_URL, {"source": 1, "destination": 2, "max_legs": 50}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("max_legs", response.data)
+
+        response = self.client.get(
+            SHORTEST_URL, {"source": 1, "destination": 2, "max_legs": ""}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def flight(self, route, departure, arrival):
+        return sample_flight(
+            route=route,
+            airplane=sample_airplane(),
+            departure_time=make_aware(datetime(2024, 12, *departure)),
+            arrival_time=make_aware(datetime(2024, 12, *arrival)),
+        )
+
+    def test_connections_respect_the_layover(self):
+        first_leg = self.flight(self.via_warsaw[0], (10, 8), (10, 10))
+        self.flight(self.via_warsaw[1], (10, 10, 30), (10, 13))
+        second_leg = self.flight(self.via_warsaw[1], (10, 12), (10, 15))
+        direct = self.flight(self.direct, (10, 9), (10, 14))
+        self.flight(self.direct, (11, 9), (11, 14))
+
+        response = self.client.get(CONNECTIONS_URL, {
+            "source": self.kyiv.id,
+            "destination": self.london.id,
+            "departure_date": "2024-12-10",
+            "min_layover": 60,
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                [flight["id"] for flight in connection["flights"]]
+                for connection in response.data
+            ],
+            [[direct.id], [first_leg.id, second_leg.id]],
+        )
+        self.assertEqual(response.data[1]["layover_minutes"], [120])
+        self.assertEqual(response.data[1]["duration_minutes"], 420)
+        self.assertEqual(
+            response.data[1]["flights"][1]["route_source"],
+            "Warsaw: airport Test Airport",
+        )
+
+    def test_connections_need_a_departure_date(self):
+        response = self.client.get(CONNECTIONS_URL, {
+            "source": self.kyiv.id, "destination": self.london.id,
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("departure_date", response.data)
+
+
+class BenchmarkRouteGraphTests(SimpleTestCase):
+    def test_reports_each_search(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_route_graph", airports=200, queries=10, stdout=out
+        )
+
+        output = out.getvalue()
+        for name in ("build", "incremental change", "dijkstra", "a*"):
+            self.assertIn(name, output)
+        self.assertIn("p95", output)
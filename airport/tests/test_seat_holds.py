@@ -0,0 +1,139 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Order, SeatHold, Ticket
+from airport.seatmap import SeatMap
+from airport.tests.test_airport_api import sample_flight
+
+SEAT_HOLD_URL = reverse("airport:seathold-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+class SeatHoldTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+
+    def hold(self, row=1, seat=1):
+        return self.client.post(
+            SEAT_HOLD_URL, {"flight": self.flight.id, "row": row, "seat": seat}
+        )
+
+    def order(self, seats):
+        return self.client.post(
+            ORDER_URL,
+            {
+                "created_at": "2024-12-01 10:00:00",
+                "tickets": [
+                    {"row": row, "seat": seat, "flight": self.flight.id}
+                    for row, seat in seats
+                ],
+            },
+            format="json",
+        )
+
+    def test_hold_seat(self):
+        response = self.hold()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(SEAT_HOLD_URL).data["count"], 1)
+
+    def test_hold_seat_out_of_range(self):
+        response = self.hold(row=100)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_hold_with_malformed_flight(self):
+        response = self.client.post(
+            SEAT_HOLD_URL,
+            {"flight": [self.flight.id], "row": 1, "seat": 1},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["flight"][0].code, "incorrect_type")
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_hold_again_extends_own_hold(self):
+        self.hold()
+        SeatHold.objects.update(expires_at=timezone.now())
+
+        response = self.hold()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.active().count(), 1)
+
+    def test_seat_held_by_other_user(self):
+        SeatHold.objects.hold(self.other_user, self.flight, 1, 1)
+
+        self.assertEqual(self.hold().status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            self.order([(1, 1)]).status_code, status.HTTP_409_CONFLICT
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_expired_hold_of_other_user(self):
+        SeatHold.objects.hold(self.other_user, self.flight, 1, 1)
+        SeatHold.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(self.hold().status_code, status.HTTP_201_CREATED)
+
+    def test_order_converts_holds_into_tickets(self):
+        self.hold(1, 1)
+        self.hold(1, 2)
+
+        response = self.order([(1, 1), (1, 2)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.count(), 2)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_hold_sold_seat(self):
+        self.order([(1, 1)])
+
+        self.assertEqual(self.hold().status_code, status.HTTP_409_CONFLICT)
+
+    def test_concurrent_sale_returns_conflict(self):
+        order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.other_user
+        )
+        Ticket.objects.create(row=1, seat=1, flight=self.flight, order=order)
+
+        with mock.patch.object(
+            SeatMap, "is_free", return_value=True
+        ):
+            response = self.order([(1, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_release_expired_holds(self):
+        SeatHold.objects.hold(self.user, self.flight, 1, 1)
+        SeatHold.objects.hold(self.user, self.flight, 1, 2)
+        SeatHold.objects.filter(seat=1).update(expires_at=timezone.now())
+        stdout = StringIO()
+
+        call_command("release_expired_holds", stdout=stdout)
+
+        self.assertIn("Released 1", stdout.getvalue())
+        self.assertEqual(SeatHold.objects.count(), 1)
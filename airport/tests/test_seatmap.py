@@ -0,0 +1,89 @@
+import base64
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket
+from airport.seatmap import SeatMap
+from airport.tests.test_airport_api import sample_flight
+
+
+class SeatMapTests(TestCase):
+    def test_take_and_is_free(self):
+        seat_map = SeatMap(60, 10, [(1, 1), (60, 10)])
+
+        self.assertFalse(seat_map.is_free(1, 1))
+        self.assertFalse(seat_map.is_free(60, 10))
+        self.assertTrue(seat_map.is_free(1, 2))
+        self.assertEqual(list(seat_map.taken()), [(1, 1), (60, 10)])
+
+    def test_seats_outside_the_grid(self):
+        seat_map = SeatMap(5, 4, [(10, 6), (1, 5), (2, 1)])
+
+        self.assertFalse(seat_map.is_free(10, 6))
+        self.assertFalse(seat_map.is_free(1, 5))
+        self.assertTrue(seat_map.is_free(2, 2))
+        self.assertEqual(
+            list(seat_map.taken()), [(1, 5), (2, 1), (10, 6)]
+        )
+
+    def test_bitmap_encoding(self):
+        seat_map = SeatMap(2, 5, [(1, 1), (2, 5)])
+
+        bits = base64.b64decode(seat_map.to_bitmap())
+
+        self.assertEqual(bits, bytes([0b00000001, 0b00000010]))
+
+
+class FlightSeatMapAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+        order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.user
+        )
+        for row, seat in [(2, 3), (1, 8)]:
+            Ticket.objects.create(
+                row=row, seat=seat, flight=self.flight, order=order
+            )
+        self.url = reverse("airport:flight-detail", args=[self.flight.id])
+
+    def test_taken_places_list(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.data["taken_places"],
+            [{"row": 1, "seat": 8}, {"row": 2, "seat": 3}]
+        )
+
+    def test_taken_places_bitmap(self):
+        response = self.client.get(self.url, {"seatmap": "bitmap"})
+
+        taken_places = response.data["taken_places"]
+        seat_map = SeatMap.from_bitmap(
+            taken_places["rows"],
+            taken_places["seats_in_row"],
+            taken_places["bitmap"],
+        )
+        self.assertEqual(list(seat_map.taken()), [(1, 8), (2, 3)])
+
+    def test_taken_places_after_airplane_shrinks(self):
+        airplane = self.flight.airplane
+        airplane.rows = 1
+        airplane.seats_in_row = 4
+        airplane.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["taken_places"],
+            [{"row": 1, "seat": 8}, {"row": 2, "seat": 3}]
+        )
@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airport.slow_queries import normalize_sql
+from airport.tests.test_airport_api import sample_flight
+
+FLIGHT_URL = reverse("airport:flight-list")
+
+
+class SlowQueryCaptureTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+        sample_flight()
+
+    def capture(self):
+        with self.assertLogs("airport.slow_queries") as logs:
+            self.client.get(FLIGHT_URL)
+        return [json.loads(record.getMessage()) for record in logs.records]
+
+    @override_settings(SLOW_QUERY={
+        "THRESHOLD_MS": 1e-6, "EXPLAIN_SAMPLE_RATE": 0.0, "LOG_FILE": None
+    })
+    def test_logs_view_and_origin(self):
+        records = self.capture()
+
+        flight_query = records[-1]
+        self.assertEqual(flight_query["view"], "FlightViewSet.list")
+        self.assertTrue(flight_query["frame"].startswith("airport/"))
+        self.assertIn("airport_flight", flight_query["sql"])
+        self.assertNotIn("explain", flight_query)
+
+    @override_settings(SLOW_QUERY={
+        "THRESHOLD_MS": 1e-6, "EXPLAIN_SAMPLE_RATE": 1.0, "LOG_FILE": None
+    })
+    def test_explains_sampled_selects(self):
+        records = self.capture()
+
+        self.assertIn("explain", records[-1])
+        self.assertNotIn("EXPLAIN failed", records[-1]["explain"])
+
+    @override_settings(SLOW_QUERY={
+        "THRESHOLD_MS": 0, "EXPLAIN_SAMPLE_RATE": 1.0, "LOG_FILE": None
+    })
+    def test_zero_threshold_disables_capture(self):
+        with self.assertNoLogs("airport.slow_queries"):
+            self.client.get(FLIGHT_URL)
+
+
+class SlowQueryReportTests(TestCase):
+    def write_log(self, records):
+        log = tempfile.NamedTemporaryFile("w", suffix=".log", delete=False)
+        with log:
+            for record in records:
+                log.write("2024-12-01T10:00:00 " + json.dumps(record) + "\n")
+            log.write("not a record\n")
+        self.addCleanup(os.remove, log.name)
+        return log.name
+
+    def test_groups_queries_and_sorts_by_total_time(self):
+        in_list = "SELECT * FROM airport_ticket WHERE id IN ({})"
+        log = self.write_log([
+            {"sql": in_list.format("%s"), "duration_ms": 300.0,
+             "view": "TickerViewSet.list", "frame": "airport/views.py:1"},
+            {"sql": in_list.format("%s, %s"), "duration_ms": 400.0,
+             "view": "TickerViewSet.list", "frame": "airport/views.py:1",
+             "explain": "Seq Scan on airport_ticket"},
+            {"sql": "SELECT * FROM airport_flight", "duration_ms": 500.0,
+             "view": "FlightViewSet.list", "frame": "airport/views.py:2"},
+        ])
+        out = StringIO()
+
+        call_command("slow_query_report", log, explain=True, stdout=out)
+
+        output = out.getvalue()
+        self.assertLess(
+            output.index("airport_ticket"), output.index("airport_flight")
+        )
+        self.assertIn("2 call(s), total 700.0 ms", output)
+        self.assertIn("TickerViewSet.list (2)", output)
+        self.assertIn("Seq Scan on airport_ticket", output)
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("SELECT 1\n  WHERE id IN (%s, %s, %s)"),
+            "SELECT 1 WHERE id IN (...)",
+        )
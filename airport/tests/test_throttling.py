@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.throttling import ScopedThrottle, UserThrottle
+
+FLIGHT_URL = reverse("airport:flight-list")
+ORDER_URL = reverse("airport:order-list")
+
+
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.request = mock.Mock(user=self.user)
+        self.now = 600.0
+
+    def allow(self):
+        throttle = UserThrottle()
+        throttle.rate = "3/min"
+        throttle.num_requests, throttle.duration = 3, 60
+        throttle.timer = lambda: self.now
+        return throttle.allow_request(self.request, None), throttle
+
+    def test_limits_requests_in_a_window(self):
+        self.assertTrue(all(self.allow()[0] for _ in range(3)))
+
+        allowed, throttle = self.allow()
+
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 60)
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        for _ in range(3):
+            self.allow()
+
+        self.now += 90
+        self.assertTrue(all(self.allow()[0] for _ in range(2)))
+        allowed, throttle = self.allow()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 10)
+
+        self.now += 60
+        self.assertTrue(self.allow()[0])
+
+
+class ScopedThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    @mock.patch.object(
+        ScopedThrottle,
+        "THROTTLE_RATES",
+        {"flight_search": "5/min", "orders": "2/min"},
+    )
+    def test_scopes_have_separate_budgets(self):
+        order = {"created_at": "2024-12-01 10:00:00", "tickets": []}
+        for _ in range(2):
+            response = self.client.post(ORDER_URL, order, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(ORDER_URL, order, format="json")
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", response)
+
+        response = self.client.get(FLIGHT_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @mock.patch.object(ScopedThrottle, "THROTTLE_RATES", {"orders": "1/min"})
+    def test_order_history_does_not_spend_the_orders_budget(self):
+        for _ in range(3):
+            response = self.client.get(ORDER_URL)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(
+            ORDER_URL,
+            {"created_at": "2024-12-01 10:00:00", "tickets": []},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,138 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from airport.models import Airplane, Flight, Order, Ticket
+from airport.serializers import OrderSerializer
+from airport.tests.test_airport_api import sample_flight
+
+
+class TicketsAvailableCounterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="<PASSWORD>"
+        )
+        self.flight = sample_flight()
+        self.order = Order.objects.create(
+            created_at="2024-12-01 10:00:00", user=self.user
+        )
+
+    def tickets_available(self, flight=None):
+        flight = flight or self.flight
+        return Flight.objects.get(pk=flight.pk).tickets_available
+
+    def test_new_flight_has_full_capacity(self):
+        self.assertEqual(self.tickets_available(), 40)
+
+    def test_ticket_create_and_delete(self):
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        self.assertEqual(self.tickets_available(), 39)
+
+        ticket.delete()
+        self.assertEqual(self.tickets_available(), 40)
+
+    def test_ticket_moved_to_another_flight(self):
+        other_flight = sample_flight()
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+
+        ticket.flight = other_flight
+        ticket.save()
+
+        self.assertEqual(self.tickets_available(), 40)
+        self.assertEqual(self.tickets_available(other_flight), 39)
+
+    def test_order_delete_releases_seats(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        Ticket.objects.create(
+            row=1, seat=2, flight=self.flight, order=self.order
+        )
+
+        self.order.delete()
+
+        self.assertEqual(self.tickets_available(), 40)
+
+    def test_bulk_order_updates_counter(self):
+        serializer = OrderSerializer(data={
+            "created_at": "2024-12-01 10:00:00",
+            "tickets": [
+                {"row": 1, "seat": seat, "flight": self.flight.id}
+                for seat in range(1, 4)
+            ],
+        })
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=self.user)
+
+        self.assertEqual(self.tickets_available(), 37)
+
+    def test_airplane_capacity_change(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        airplane = self.flight.airplane
+        airplane.rows = 10
+        airplane.save()
+
+        self.assertEqual(self.tickets_available(), 79)
+
+    def test_airplane_save_without_capacity_change(self):
+        airplane = Airplane.objects.get(pk=self.flight.airplane_id)
+        airplane.name = "Renamed"
+
+        with CaptureQueriesContext(connection) as queries:
+            airplane.save()
+
+        self.assertFalse(any(
+            "tickets_available" in query["sql"] for query in queries
+        ))
+
+    def test_flight_update_keeps_concurrent_counter_changes(self):
+        flight = Flight.objects.get(pk=self.flight.pk)
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+
+        flight.departure_time = "2024-12-02 10:00:00"
+        with CaptureQueriesContext(connection) as queries:
+            flight.save()
+
+        self.assertFalse(any(
+            "tickets_available" in query["sql"] for query in queries
+        ))
+        self.assertEqual(self.tickets_available(), 39)
+
+    def test_flight_moved_to_another_airplane(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        flight = Flight.objects.get(pk=self.flight.pk)
+        flight.airplane = sample_flight().airplane
+        flight.airplane.rows = 10
+        flight.airplane.save()
+
+        flight.save()
+
+        self.assertEqual(flight.tickets_available, 79)
+        self.assertEqual(self.tickets_available(), 79)
+
+    def test_rebuild_command(self):
+        Flight.objects.update(tickets_available=0)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_tickets_available", check=True,
+                         stdout=StringIO())
+
+        call_command("rebuild_tickets_available", stdout=StringIO())
+        call_command("rebuild_tickets_available", check=True,
+                     stdout=StringIO())
+        self.assertEqual(self.tickets_available(), 40)
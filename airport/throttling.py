@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Sliding-window counter on the shared ``THROTTLE_CACHE``.
+
+    Instead of a timestamp history per client it keeps one counter per
+    fixed window and weights the previous window by how much of it still
+    overlaps the sliding window, so a check is one ``get_many`` and one
+    ``incr`` whatever the rate. With Redis behind the cache the counters
+    are shared by every worker; locmem stands in for it locally.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE["ALIAS"]]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now, self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+
+        counts = self.cache.get_many([previous_key, current_key])
+        self.previous = counts.get(previous_key, 0)
+        self.current = counts.get(current_key, 0)
+        if self.estimate() >= self.num_requests:
+            return self.throttle_failure()
+
+        # Two windows, the previous one is still read during the next.
+        self.cache.add(current_key, 0, self.duration * 2)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, self.duration * 2)
+        return self.throttle_success()
+
+    def estimate(self):
+        overlap = 1 - self.elapsed / self.duration
+        return self.previous * overlap + self.current
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until the estimate drops below the limit again."""
+        if self.current < self.num_requests:
+            # Only the previous window's share has to decay.
+            share = (self.num_requests - self.current) / self.previous
+            return max(self.duration * (1 - share) - self.elapsed, 0)
+
+        # The current window becomes the previous one and decays from there.
+        share = self.num_requests / self.current
+        return self.duration - self.elapsed + self.duration * (1 - share)
+
+
+class AnonThrottle(AnonRateThrottle, SlidingWindowThrottle):
+    pass
+
+
+class UserThrottle(UserRateThrottle, SlidingWindowThrottle):
+    pass
+
+
+class ScopedThrottle(ScopedRateThrottle, SlidingWindowThrottle):
+    """Per-endpoint budget for views that set ``throttle_scope``."""
@@ -1,6 +1,7 @@
 from rest_framework import routers
 from django.urls import path, include
 
+from airport.async_views import flight_detail, flight_list
 from airport.views import (
     CrewViewSet,
     AirportViewSet,
@@ -9,6 +10,7 @@ from airport.views import (
     FlightViewSet,
     AirplaneViewSet,
     OrderViewSet,
+    SeatHoldViewSet,
     TickerViewSet
 )
 
@@ -23,9 +25,16 @@ router.register("flights", FlightViewSet)
 router.register("airplanes", AirplaneViewSet)
 router.register("orders", OrderViewSet)
 router.register("tickets", TickerViewSet)
+router.register("seat_holds", SeatHoldViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("async/flights/", flight_list, name="flight-list-async"),
+    path(
+        "async/flights/<int:pk>/",
+        flight_detail,
+        name="flight-detail-async"
+    ),
 ]
 
 app_name = "airport"
@@ -1,12 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Prefetch
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import F, Count
 from rest_framework.viewsets import GenericViewSet
 
+from airport.caching import CachedListMixin
+from airport.conditional import ConditionalGetMixin
+from airport.converters import FastListMixin
+from airport.exports import (
+    FLIGHT_EXPORT_FIELDS,
+    TICKET_EXPORT_FIELDS,
+    export_response,
+)
+from airport.instrumentation import (
+    SerializerTimingMixin,
+    measure_serialization,
+)
 from airport.models import (
     Crew,
     Airport,
@@ -15,8 +30,25 @@ from airport.models import (
     Flight,
     Airplane,
     Order,
+    SeatHold,
     Ticket
 )
+from airport.filters import (
+    filter_flights,
+    filter_orders,
+    filter_queryset,
+    param_to_datetime,
+    param_to_int,
+    params_to_ints,
+)
+from airport.pagination import (
+    FlightPagination,
+    OrderPagination,
+    TicketPagination,
+)
+from airport.reference_data import ReferenceDataMixin
+from airport.replicas import ReplicaReadMixin
+from airport.route_graph import find_connections, route_graph
 from airport.serializers import (
     CrewSerializer,
     AirportSerializer,
@@ -29,33 +61,59 @@ from airport.serializers import (
     FlightDetailSerializer,
     AirplaneSerializer,
     AirplaneImageSerializer,
+    ConnectionSerializer,
     OrderSerializer,
     OrderListSerializer,
+    RoutePathSerializer,
+    SeatHoldSerializer,
     TicketSerializer,
     TicketListSerializer
 )
+from user.authentication import StatelessJWTAuthentication
 
 
-class CrewViewSet(viewsets.ModelViewSet):
+class CrewViewSet(ReplicaReadMixin,
+                  SerializerTimingMixin,
+                  viewsets.ModelViewSet,
+                  ):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
+    authentication_classes = (StatelessJWTAuthentication,)
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(ReplicaReadMixin,
+                     ReferenceDataMixin,
+                     ConditionalGetMixin,
+                     SerializerTimingMixin,
+                     viewsets.ModelViewSet,
+                     ):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
+    authentication_classes = (StatelessJWTAuthentication,)
+    conditional_models = (Airport,)
 
     def get_queryset(self):
         closest_big_city = self.request.query_params.get("closest_big_city")
 
+        if self.action == "list" and self.reference_data is not None:
+            airports = self.reference_data.airport_list
+            if closest_big_city:
+                needle = closest_big_city.casefold()
+                airports = [
+                    airport for airport in airports
+                    if needle in airport.closest_big_city.casefold()
+                ]
+            return airports
+
         queryset = self.queryset
 
         if closest_big_city:
-            queryset = queryset.filter(
+            queryset = filter_queryset(
+                queryset,
                 closest_big_city__icontains=closest_big_city
             )
 
-        return queryset.distinct()
+        return queryset
 
     @extend_schema(
         parameters=[
@@ -70,12 +128,24 @@ class AirportViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(ReplicaReadMixin,
+                   ReferenceDataMixin,
+                   ConditionalGetMixin,
+                   SerializerTimingMixin,
+                   viewsets.ModelViewSet,
+                   ):
     queryset = Route.objects.all().select_related(
         "source",
         "destination"
     )
     serializer_class = RouteSerializer
+    authentication_classes = (StatelessJWTAuthentication,)
+    conditional_models = (Route, Airport)
+
+    def get_queryset(self):
+        if self.action == "list" and self.reference_data is not None:
+            return Route.objects.all()
+        return self.queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -84,27 +154,95 @@ class RouteViewSet(viewsets.ModelViewSet):
             return RouteDetailSerializer
         return RouteSerializer
 
-
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="source",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Source airport id"
+            ),
+            OpenApiParameter(
+                name="destination",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Destination airport id"
+            ),
+            OpenApiParameter(
+                name="k",
+                type=OpenApiTypes.INT,
+                description="Number of paths, 1 by default"
+            ),
+            OpenApiParameter(
+                name="max_legs",
+                type=OpenApiTypes.INT,
+                description="Longest path in routes (ex. ?max_legs=2)"
+            )
+        ],
+        responses=RoutePathSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="shortest")
+    def shortest(self, request):
+        """Shortest route paths between two airports, shortest first."""
+        params = request.query_params
+        max_legs = params.get("max_legs")
+        paths = route_graph().k_shortest_paths(
+            param_to_int(params.get("source"), "source"),
+            param_to_int(params.get("destination"), "destination"),
+            param_to_int(
+                params.get("k", 1), "k",
+                maximum=settings.ROUTE_GRAPH["MAX_PATHS"]
+            ),
+            param_to_int(
+                max_legs, "max_legs",
+                maximum=settings.ROUTE_GRAPH["MAX_LEGS"]
+            ) if max_legs else None,
+        )
+        serializer = RoutePathSerializer(
+            [
+                {"distance": distance, "airports": airports, "routes": routes}
+                for distance, airports, routes in paths
+            ],
+            many=True,
+        )
+        with measure_serialization():
+            data = serializer.data
+        return Response(data)
+
+
+class AirplaneTypeViewSet(ReplicaReadMixin,
+                          ReferenceDataMixin,
+                          ConditionalGetMixin,
+                          SerializerTimingMixin,
+                          viewsets.ModelViewSet,
+                          ):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
+    authentication_classes = (StatelessJWTAuthentication,)
+    conditional_models = (AirplaneType,)
 
-
-class FlightViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        if self.action == "list" and self.reference_data is not None:
+            return self.reference_data.airplane_type_list
+        return self.queryset
+
+
+class FlightViewSet(ReplicaReadMixin,
+                    ReferenceDataMixin,
+                    CachedListMixin,
+                    FastListMixin,
+                    SerializerTimingMixin,
+                    viewsets.ModelViewSet,
+                    ):
     queryset = Flight.objects.all().select_related(
         "airplane",
         "route__source",
         "route__destination"
-    ).prefetch_related(
-        "crew"
-    ).annotate(
-        tickets_available=F(
-            "airplane__rows"
-        ) * F(
-            "airplane__seats_in_row"
-        ) - Count("tickets")
     )
     serializer_class = FlightSerializer
+    authentication_classes = (StatelessJWTAuthentication,)
+    pagination_class = FlightPagination
+    throttle_scope = "flight_search"
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -114,26 +252,19 @@ class FlightViewSet(viewsets.ModelViewSet):
         return FlightSerializer
 
     def get_queryset(self):
-        departure_time = self.request.query_params.get("departure_time")
-        source = self.request.query_params.get("route_source")
-        destination = self.request.query_params.get("route_destination")
-
         queryset = self.queryset
 
-        if departure_time:
-            queryset = queryset.filter(
-                departure_time__icontains=departure_time
-            )
-        if source:
-            queryset = queryset.filter(
-                route__source__closest_big_city__icontains=source
-            )
-        if destination:
-            queryset = queryset.filter(
-                route__destination__closest_big_city__icontains=destination
-            )
+        if self.action == "list":
+            queryset = Flight.objects.for_listing(self.reference_data)
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related("crew")
+
+        return filter_flights(queryset, self.request.query_params)
 
-        return queryset.distinct()
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["seatmap"] = self.request.query_params.get("seatmap")
+        return context
 
     @extend_schema(
         parameters=[
@@ -151,18 +282,227 @@ class FlightViewSet(viewsets.ModelViewSet):
                 name="route_destination",
                 type=OpenApiTypes.STR,
                 description="Filter by route destination"
+            ),
+            OpenApiParameter(
+                name="source",
+                type=OpenApiTypes.STR,
+                description="Filter by source airport ids (ex. ?source=1,2)"
+            ),
+            OpenApiParameter(
+                name="destination",
+                type=OpenApiTypes.STR,
+                description="Filter by destination airport ids "
+                            "(ex. ?destination=3)"
+            ),
+            OpenApiParameter(
+                name="source_city",
+                type=OpenApiTypes.STR,
+                description="Filter by source city prefix, case-sensitive "
+                            "(ex. ?source_city=Kyi)"
+            ),
+            OpenApiParameter(
+                name="destination_city",
+                type=OpenApiTypes.STR,
+                description="Filter by destination city prefix, "
+                            "case-sensitive (ex. ?destination_city=Lon)"
+            ),
+            OpenApiParameter(
+                name="departure_date_from",
+                type=OpenApiTypes.DATE,
+                description="Flights departing on or after this date"
+            ),
+            OpenApiParameter(
+                name="departure_date_to",
+                type=OpenApiTypes.DATE,
+                description="Flights departing on or before this date"
             )
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="seatmap",
+                type=OpenApiTypes.STR,
+                enum=["bitmap"],
+                description="Return taken places as a base64 seat bitmap "
+                            "(ex. ?seatmap=bitmap)"
+            )
+        ]
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="source",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Source airport id"
+            ),
+            OpenApiParameter(
+                name="destination",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Destination airport id"
+            ),
+            OpenApiParameter(
+                name="departure_date",
+                type=OpenApiTypes.DATE,
+                required=True,
+                description="Date the first flight departs"
+            ),
+            OpenApiParameter(
+                name="k",
+                type=OpenApiTypes.INT,
+                description="Number of route paths to search, 3 by default"
+            ),
+            OpenApiParameter(
+                name="max_legs",
+                type=OpenApiTypes.INT,
+                description="Most flights per connection"
+            ),
+            OpenApiParameter(
+                name="min_layover",
+                type=OpenApiTypes.INT,
+                description="Minimum minutes between flights"
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                description="Number of connections, 20 by default"
+            )
+        ],
+        responses=ConnectionSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="connections")
+    def connections(self, request):
+        """Flight connections along the shortest route paths."""
+        params = request.query_params
+        graph_settings = settings.ROUTE_GRAPH
+        departure_from = param_to_datetime(
+            params.get("departure_date", ""), "departure_date"
+        )
+        min_layover = graph_settings["MIN_LAYOVER"]
+        if params.get("min_layover"):
+            min_layover = timedelta(minutes=param_to_int(
+                params["min_layover"], "min_layover", minimum=0,
+                maximum=int(
+                    graph_settings["MAX_LAYOVER"].total_seconds() / 60
+                ),
+            ))
+
+        paths = route_graph().k_shortest_paths(
+            param_to_int(params.get("source"), "source"),
+            param_to_int(params.get("destination"), "destination"),
+            param_to_int(
+                params.get("k", 3), "k",
+                maximum=graph_settings["MAX_PATHS"]
+            ),
+            param_to_int(
+                params.get("max_legs", graph_settings["MAX_LEGS"]),
+                "max_legs",
+                maximum=graph_settings["MAX_LEGS"],
+            ),
+        )
+        connections = find_connections(
+            paths,
+            departure_from,
+            departure_from + timedelta(days=1),
+            min_layover,
+            graph_settings["MAX_LAYOVER"],
+            self.reference_data,
+        )
+        limit = param_to_int(params.get("limit", 20), "limit", maximum=100)
+        serializer = ConnectionSerializer(
+            connections[:limit],
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        with measure_serialization():
+            data = serializer.data
+        return Response(data)
 
-class AirplaneViewSet(viewsets.ModelViewSet):
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="output",
+                type=OpenApiTypes.STR,
+                enum=["ndjson", "csv"],
+                description="Export format, ndjson by default"
+            ),
+            OpenApiParameter(
+                name="flight",
+                type=OpenApiTypes.STR,
+                description="Filter by flight ids (ex. ?flight=1,2)"
+            ),
+            OpenApiParameter(
+                name="departure_date_from",
+                type=OpenApiTypes.DATE,
+                description="Flights departing on or after this date"
+            ),
+            OpenApiParameter(
+                name="departure_date_to",
+                type=OpenApiTypes.DATE,
+                description="Flights departing on or before this date"
+            )
+        ]
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        permission_classes=[IsAdminUser],
+        url_path="export",
+    )
+    def export(self, request):
+        params = request.query_params
+        queryset = Flight.objects.order_by("departure_time", "id")
+
+        if params.get("flight"):
+            queryset = queryset.filter(
+                id__in=params_to_ints(params["flight"], "flight")
+            )
+        if params.get("departure_date_from"):
+            queryset = queryset.filter(
+                departure_time__gte=param_to_datetime(
+                    params["departure_date_from"], "departure_date_from"
+                )
+            )
+        if params.get("departure_date_to"):
+            queryset = queryset.filter(
+                departure_time__lt=param_to_datetime(
+                    params["departure_date_to"], "departure_date_to", days=1
+                )
+            )
+
+        return export_response(
+            queryset,
+            FLIGHT_EXPORT_FIELDS,
+            params.get("output", "ndjson"),
+            "flights",
+        )
+
+
+class AirplaneViewSet(ReplicaReadMixin,
+                      ReferenceDataMixin,
+                      ConditionalGetMixin,
+                      SerializerTimingMixin,
+                      viewsets.ModelViewSet,
+                      ):
     queryset = Airplane.objects.all().select_related(
         "airplane_type"
     )
     serializer_class = AirplaneSerializer
+    authentication_classes = (StatelessJWTAuthentication,)
+    conditional_models = (Airplane, AirplaneType)
+
+    def get_queryset(self):
+        if self.action == "list" and self.reference_data is not None:
+            return Airplane.objects.all()
+        return self.queryset
 
     def get_serializer_class(self):
         if self.action == "upload_image":
@@ -186,18 +526,49 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class OrderViewSet(mixins.ListModelMixin,
+class OrderViewSet(ReferenceDataMixin,
+                   FastListMixin,
+                   SerializerTimingMixin,
+                   mixins.ListModelMixin,
                    mixins.CreateModelMixin,
                    GenericViewSet,
                    ):
-    queryset = Order.objects.all().select_related(
-        "user"
-    )
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    pagination_class = OrderPagination
     permission_classes = (IsAuthenticated,)
 
+    @property
+    def throttle_scope(self):
+        # Only placing orders spends the "orders" budget, browsing the
+        # history is left to the per-user rate.
+        return "orders" if self.action == "create" else None
+
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user)
+        queryset = self.queryset.filter(user=self.request.user)
+        if self.action == "list":
+            queryset = filter_orders(
+                queryset.history(self.reference_data),
+                self.request.query_params,
+            )
+        return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="created_date_from",
+                type=OpenApiTypes.DATE,
+                description="Orders created on or after this date"
+            ),
+            OpenApiParameter(
+                name="created_date_to",
+                type=OpenApiTypes.DATE,
+                description="Orders created on or before this date"
+            )
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
@@ -209,13 +580,35 @@ class OrderViewSet(mixins.ListModelMixin,
         serializer.save(user=self.request.user)
 
 
-class TickerViewSet(viewsets.ModelViewSet):
+class SeatHoldViewSet(SerializerTimingMixin,
+                      mixins.ListModelMixin,
+                      mixins.CreateModelMixin,
+                      mixins.DestroyModelMixin,
+                      GenericViewSet,
+                      ):
+    queryset = SeatHold.objects.all()
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        return self.queryset.active().filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class TickerViewSet(ReferenceDataMixin,
+                    FastListMixin,
+                    SerializerTimingMixin,
+                    viewsets.ModelViewSet,
+                    ):
     queryset = Ticket.objects.all().select_related(
         "flight__route__source",
         "flight__route__destination",
         "flight__airplane"
     )
     serializer_class = TicketSerializer
+    pagination_class = TicketPagination
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
@@ -226,10 +619,23 @@ class TickerViewSet(viewsets.ModelViewSet):
         order_id_str = self.request.query_params.get("order")
         queryset = self.queryset
 
+        if self.action in ("list", "retrieve"):
+            queryset = Ticket.objects.only(
+                "id", "row", "seat", "flight_id", "order_id"
+            ).prefetch_related(
+                Prefetch(
+                    "flight",
+                    queryset=Flight.objects.for_listing(self.reference_data)
+                )
+            )
+
         if order_id_str:
-            queryset = queryset.filter(order_id=int(order_id_str))
+            queryset = filter_queryset(
+                queryset,
+                order_id=int(order_id_str)
+            )
 
-        return queryset.distinct()
+        return queryset
 
     @extend_schema(
         parameters=[
@@ -242,3 +648,73 @@ class TickerViewSet(viewsets.ModelViewSet):
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="output",
+                type=OpenApiTypes.STR,
+                enum=["ndjson", "csv"],
+                description="Export format, ndjson by default"
+            ),
+            OpenApiParameter(
+                name="flight",
+                type=OpenApiTypes.STR,
+                description="Filter by flight ids (ex. ?flight=1,2)"
+            ),
+            OpenApiParameter(
+                name="order",
+                type=OpenApiTypes.STR,
+                description="Filter by order ids (ex. ?order=2)"
+            ),
+            OpenApiParameter(
+                name="departure_date_from",
+                type=OpenApiTypes.DATE,
+                description="Tickets for flights departing on or after "
+                            "this date"
+            ),
+            OpenApiParameter(
+                name="departure_date_to",
+                type=OpenApiTypes.DATE,
+                description="Tickets for flights departing on or before "
+                            "this date"
+            )
+        ]
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        permission_classes=[IsAdminUser],
+        url_path="export",
+    )
+    def export(self, request):
+        params = request.query_params
+        queryset = Ticket.objects.order_by("id")
+
+        if params.get("flight"):
+            queryset = queryset.filter(
+                flight_id__in=params_to_ints(params["flight"], "flight")
+            )
+        if params.get("order"):
+            queryset = queryset.filter(
+                order_id__in=params_to_ints(params["order"], "order")
+            )
+        if params.get("departure_date_from"):
+            queryset = queryset.filter(
+                flight__departure_time__gte=param_to_datetime(
+                    params["departure_date_from"], "departure_date_from"
+                )
+            )
+        if params.get("departure_date_to"):
+            queryset = queryset.filter(
+                flight__departure_time__lt=param_to_datetime(
+                    params["departure_date_to"], "departure_date_to", days=1
+                )
+            )
+
+        return export_response(
+            queryset,
+            TICKET_EXPORT_FIELDS,
+            params.get("output", "ndjson"),
+            "tickets",
+        )
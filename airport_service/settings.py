@@ -11,8 +11,10 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 from datetime import timedelta
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
+import django
 import os
 
 load_dotenv()
@@ -29,10 +31,18 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv("SECRET_KEY")
 
 
+# "development" or "production"; production turns off DEBUG and
+# debug_toolbar and is served by gunicorn (see gunicorn.conf.py).
+DJANGO_ENV = os.getenv("DJANGO_ENV", "development")
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv(
+    "DJANGO_DEBUG", str(DJANGO_ENV == "development")
+).lower() in ("1", "true", "yes")
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.getenv("DJANGO_ALLOWED_HOSTS", "").split(",") if host
+]
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -50,15 +60,14 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "rest_framework.authtoken",
-    "debug_toolbar",
     "drf_spectacular",
     "airport",
     "user",
 ]
 
 MIDDLEWARE = [
+    "airport.instrumentation.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -67,6 +76,12 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if DEBUG:
+    INSTALLED_APPS.insert(
+        INSTALLED_APPS.index("drf_spectacular"), "debug_toolbar"
+    )
+    MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "airport_service.urls"
 
 TEMPLATES = [
@@ -99,7 +114,185 @@ DATABASES = {
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": os.environ["POSTGRES_PORT"],
+        # Persistent connections are not recommended under ASGI, so they
+        # default to off with uvicorn workers.
+        "CONN_MAX_AGE": int(os.getenv(
+            "DB_CONN_MAX_AGE",
+            0 if os.getenv("GUNICORN_WORKER_CLASS", "").startswith("uvicorn")
+            else 60
+        )),
+        "CONN_HEALTH_CHECKS": os.getenv(
+            "DB_CONN_HEALTH_CHECKS", "true"
+        ).lower() in ("1", "true", "yes"),
+    }
+}
+
+# Django 5.1+ with psycopg 3 ships a native connection pool; one
+# connection per worker thread is enough, so the pool follows
+# GUNICORN_THREADS unless DB_POOL_MAX_SIZE is set.
+if os.getenv("DB_POOL", "").lower() in ("1", "true", "yes"):
+    if django.VERSION < (5, 1):
+        raise ImproperlyConfigured("DB_POOL needs Django 5.1 or newer")
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+            "max_size": int(os.getenv(
+                "DB_POOL_MAX_SIZE", os.getenv("GUNICORN_THREADS", 4)
+            )),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", 10)),
+        }
     }
+
+# Read replicas, one alias per host in DB_REPLICA_HOSTS with the primary's
+# credentials. Safe-method requests on catalog viewsets read from them
+# (see airport.replicas); tests mirror them to the primary.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+    filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1
+):
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{number}")
+
+DATABASE_ROUTERS = ["airport.replicas.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+# Invalidation of the in-process caches below and the throttle counters
+# go through this cache, so production workers have to share it.
+if os.getenv("CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["CACHE_URL"],
+        }
+    }
+elif DJANGO_ENV == "production":
+    raise ImproperlyConfigured(
+        "Set CACHE_URL to a shared cache when DJANGO_ENV=production"
+    )
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "airport-service",
+            "OPTIONS": {
+                "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 1000)),
+            },
+        }
+    }
+
+FLIGHT_SEARCH_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": int(os.getenv("FLIGHT_SEARCH_CACHE_TIMEOUT", 60)),
+}
+
+# Airports, routes, airplane types and airplanes are kept in memory per
+# process (airport.reference_data); a table with more than MAX_ROWS rows
+# is joined instead, 0 turns the cache off. Snapshots are reloaded at
+# least every TIMEOUT seconds.
+REFERENCE_DATA = {
+    "ALIAS": "default",
+    "MAX_ROWS": int(os.getenv("REFERENCE_DATA_MAX_ROWS", 10000)),
+    "TIMEOUT": int(os.getenv("REFERENCE_DATA_TIMEOUT", 300)),
+}
+
+# In-process route graph for shortest paths and connection search, kept
+# current by a journal of route changes in this cache.
+ROUTE_GRAPH = {
+    "ALIAS": "default",
+    "LANDMARKS": int(os.getenv("ROUTE_GRAPH_LANDMARKS", 8)),
+    "MAX_REPLAY": int(os.getenv("ROUTE_GRAPH_MAX_REPLAY", 1000)),
+    "MAX_PATHS": 10,
+    "MAX_LEGS": int(os.getenv("ROUTE_GRAPH_MAX_LEGS", 3)),
+    "MIN_LAYOVER": timedelta(
+        minutes=int(os.getenv("CONNECTION_MIN_LAYOVER_MINUTES", 60))
+    ),
+    "MAX_LAYOVER": timedelta(
+        minutes=int(os.getenv("CONNECTION_MAX_LAYOVER_MINUTES", 24 * 60))
+    ),
+}
+
+# Change markers behind the ETag/Last-Modified of the catalog endpoints,
+# rebuilt from the tables at least every TIMEOUT seconds.
+CATALOG_MARKER_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": int(os.getenv("CATALOG_MARKER_TIMEOUT", 60)),
+}
+
+
+SEAT_HOLD_TTL = timedelta(
+    minutes=int(os.getenv("SEAT_HOLD_TTL_MINUTES", 10))
+)
+
+
+# Per-request latency, DB, serializer and render time and query count,
+# logged to ``airport.requests`` and served at /metrics. SAMPLE_RATE trades
+# detail for overhead; set METRICS_TOKEN to require
+# "Authorization: Bearer <token>". Without a token /metrics is staff-only
+# in production.
+REQUEST_METRICS = {
+    "SAMPLE_RATE": float(os.getenv("REQUEST_METRICS_SAMPLE_RATE", 1.0)),
+    "TOKEN": os.getenv("METRICS_TOKEN"),
+    "PUBLIC": DJANGO_ENV != "production",
+}
+
+# Workers add their request metrics to counters in this cache at most
+# every FLUSH_INTERVAL seconds and before serving /metrics, which then
+# reports the totals of all workers sharing it.
+REQUEST_METRICS_CACHE = {
+    "ALIAS": "default",
+    "FLUSH_INTERVAL": float(os.getenv("REQUEST_METRICS_FLUSH_INTERVAL", 10)),
+}
+
+# Queries slower than THRESHOLD_MS (0 disables) are logged as JSON lines
+# to ``airport.slow_queries``, with EXPLAIN output for a sampled share of
+# SELECTs; ``manage.py slow_query_report`` summarizes LOG_FILE.
+SLOW_QUERY = {
+    "THRESHOLD_MS": float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 200)),
+    "EXPLAIN_SAMPLE_RATE": float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", 0.0)),
+    "LOG_FILE": os.getenv("SLOW_QUERY_LOG_FILE"),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "message": {"format": "{message}", "style": "{"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "slow_queries": (
+            {
+                "class": "logging.handlers.WatchedFileHandler",
+                "filename": SLOW_QUERY["LOG_FILE"],
+                "formatter": "message",
+            }
+            if SLOW_QUERY["LOG_FILE"]
+            else {"class": "logging.StreamHandler"}
+        ),
+    },
+    "loggers": {
+        "airport.requests": {
+            "handlers": ["console"],
+            "level": os.getenv(
+                "REQUEST_LOG_LEVEL",
+                "INFO" if DJANGO_ENV == "production" else "WARNING",
+            ),
+            "propagate": False,
+        },
+        "airport.slow_queries": {
+            "handlers": ["slow_queries"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
 }
 
 
@@ -138,8 +331,11 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
 STATIC_URL = "static/"
+# collectstatic target; in production nginx serves it and MEDIA_ROOT
+# (see nginx.conf), Django only serves them itself with DEBUG on.
+STATIC_ROOT = os.getenv("STATIC_ROOT", BASE_DIR / "static")
 
-MEDIA_ROOT = BASE_DIR / "media"
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", BASE_DIR / "media")
 MEDIA_URL = "/media/"
 
 # Default primary key field type
@@ -159,25 +355,50 @@ REST_FRAMEWORK = {
         "airport.permissions.IsAdminOrIfAuthenticatedReadOnly"
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 5,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle"
+        "airport.throttling.AnonThrottle",
+        "airport.throttling.UserThrottle",
+        "airport.throttling.ScopedThrottle",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_RATES": {
         "anon": "50/day",
-        "user": "100/day"
+        "user": "100/day",
+        "flight_search": os.getenv("THROTTLE_FLIGHT_SEARCH_RATE", "30/min"),
+        "orders": os.getenv("THROTTLE_ORDERS_RATE", "10/min"),
     }
 }
 
+# Build the flight, ticket and order list responses with compiled row
+# converters and orjson (when installed) instead of the serializers.
+FAST_LIST_RENDERING = os.getenv(
+    "FAST_LIST_RENDERING", ""
+).lower() in ("1", "true", "yes")
+
+# Throttle counters must be shared by all workers, so point this at a
+# Redis cache (CACHE_URL) in production.
+THROTTLE_CACHE = {
+    "ALIAS": "default",
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "user.serializers.UserTokenObtainPairSerializer"
+    ),
+}
+
+# Users resolved from access tokens are cached per token ``jti``; saving
+# or deleting the user drops them.
+JWT_USER_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": int(os.getenv("JWT_USER_CACHE_TIMEOUT", 300)),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -0,0 +1,13 @@
+"""Settings for the test suite.
+
+``python manage.py test --settings=airport_service.test_settings`` adds a
+second local database standing in for a read replica, used by the
+routing tests in ``airport.tests.test_replicas``.
+"""
+from airport_service.settings import *  # noqa: F401,F403
+from airport_service.settings import DATABASES
+
+DATABASES["replica_stand_in"] = {
+    **DATABASES["default"],
+    "TEST": {"NAME": f"test_{DATABASES['default']['NAME']}_replica"},
+}
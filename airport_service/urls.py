@@ -25,11 +25,13 @@ from drf_spectacular.views import (
     SpectacularSwaggerView
 )
 
+from airport.instrumentation import metrics_view
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/airport/", include("airport.urls", namespace="airport")),
-    path("__debug__/", include("debug_toolbar.urls")),
     path("api/user/", include("user.urls", namespace="user")),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
@@ -43,3 +45,6 @@ urlpatterns = [
         name="redoc"
     ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
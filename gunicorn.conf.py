@@ -0,0 +1,34 @@
+"""Gunicorn settings for DJANGO_ENV=production, tuned by environment.
+
+GUNICORN_WORKER_CLASS=gthread (default) serves the WSGI app with
+prefork workers and threads; uvicorn.workers.UvicornWorker serves the
+ASGI app so the async endpoints run on an event loop.
+"""
+import multiprocessing
+import os
+
+
+def env_flag(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(
+    os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+)
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+if worker_class.startswith("uvicorn"):
+    wsgi_app = "airport_service.asgi:application"
+else:
+    wsgi_app = "airport_service.wsgi:application"
+
+# Import Django once in the master so workers fork with the app loaded.
+preload_app = env_flag("GUNICORN_PRELOAD", "true")
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 200))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
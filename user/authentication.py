@@ -0,0 +1,132 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from airport.generations import bump_generation, current_generation
+
+# Every other concrete field of the user is cached with the token.
+UNCACHED_USER_FIELDS = ("password",)
+
+
+def jwt_user_cache():
+    return caches[settings.JWT_USER_CACHE["ALIAS"]]
+
+
+def jwt_user_version_key(user_id):
+    return f"jwt-user:{user_id}:version"
+
+
+def invalidate_jwt_user(user_id):
+    """Drop every cached token of the user.
+
+    Cached tokens are only valid while they match the user's current
+    version, so replacing the version is enough.
+    """
+    bump_generation(jwt_user_cache(), jwt_user_version_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that caches the resolved user by token ``jti``.
+
+    The user comes back with every field but ``UNCACHED_USER_FIELDS``
+    loaded, so the user endpoints need no further query; the password
+    hash is deferred and loaded on first access, and ``save()`` only
+    writes the loaded fields.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+            jti = validated_token[api_settings.JTI_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        # ``from_db`` expects values in the model's field order.
+        field_names = [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname not in UNCACHED_USER_FIELDS
+        ]
+        cache = jwt_user_cache()
+        token_key = f"jwt-user:{user_id}:{jti}"
+        version_key = jwt_user_version_key(user_id)
+        cached = cache.get_many([token_key, version_key])
+        version = cached.get(version_key)
+
+        entry = cached.get(token_key)
+        if entry is not None and version is not None and entry[0] == version:
+            values = entry[1]
+        else:
+            values = self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list(*field_names).first()
+            if values is None:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                )
+            if version is None:
+                version = current_generation(cache, version_key)
+            timeout = min(
+                settings.JWT_USER_CACHE["TIMEOUT"],
+                validated_token["exp"] - int(time.time()),
+            )
+            if version is not None and timeout > 0:
+                cache.set(token_key, (version, values), timeout)
+
+        user = self.user_model.from_db(
+            router.db_for_write(self.user_model), field_names, values
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        return user
+
+
+class StatelessJWTAuthentication(CachedJWTAuthentication):
+    """Skip the user lookup entirely for read-only requests.
+
+    Safe methods get a ``TokenUser`` built from the token claims
+    (``is_staff`` is added by ``UserTokenObtainPairSerializer``), so a
+    revoked staff flag or a deactivated account is only noticed once the
+    access token expires. Actions restricted to ``IsAdminUser`` (the
+    exports) still load the user, so a revoked staff flag applies at
+    once there.
+    """
+
+    stateless = JWTStatelessUserAuthentication()
+
+    def authenticate(self, request):
+        self.safe_request = (
+            request.method in SAFE_METHODS
+            and not self.requires_staff(request)
+        )
+        return super().authenticate(request)
+
+    @staticmethod
+    def requires_staff(request):
+        view = (getattr(request, "parser_context", None) or {}).get("view")
+        if view is None:
+            return False
+        return any(
+            isinstance(permission, IsAdminUser)
+            for permission in view.get_permissions()
+        )
+
+    def get_user(self, validated_token):
+        if self.safe_request:
+            return self.stateless.get_user(validated_token)
+        return super().get_user(validated_token)
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -39,3 +40,12 @@ class UserDetailSerializer(UserSerializer):
             "first_name",
             "last_name",
         )
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        """Add the claims ``StatelessJWTAuthentication`` relies on"""
+        token = super().get_token(user)
+        token["is_staff"] = user.is_staff
+        return token
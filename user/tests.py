@@ -1,3 +1,134 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from user.authentication import (
+    CachedJWTAuthentication,
+    StatelessJWTAuthentication,
+    jwt_user_cache,
+)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        jwt_user_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="testpass"
+        )
+        self.factory = APIRequestFactory()
+
+    def request(self, method="get", user=None):
+        token = AccessToken.for_user(user or self.user)
+        return getattr(self.factory, method)(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        ), token
+
+    def authenticate(self, request, authentication=CachedJWTAuthentication):
+        return authentication().authenticate(request)[0]
+
+    def test_user_is_looked_up_once_per_token(self):
+        request, _ = self.request()
+
+        with self.assertNumQueries(1):
+            self.authenticate(request)
+        with self.assertNumQueries(0):
+            user = self.authenticate(request)
+
+        self.assertEqual(user, self.user)
+        self.assertFalse(user.is_staff)
+        self.assertEqual(user.email, self.user.email)
+
+    def test_saving_the_user_drops_cached_tokens(self):
+        request, _ = self.request()
+        self.authenticate(request)
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(request)
+
+    def test_cached_user_saves_only_loaded_fields(self):
+        request, _ = self.request()
+        self.authenticate(request)
+        user = self.authenticate(request)
+
+        user.first_name = "Cached"
+        user.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Cached")
+        self.assertTrue(self.user.check_password("testpass"))
+
+    def test_password_change_drops_cached_tokens(self):
+        request, _ = self.request()
+        self.authenticate(request)
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        client.patch(reverse("user:manage"), {"password": "newpass"})
+
+        with self.assertNumQueries(1):
+            self.authenticate(request)
+
+    def test_manage_user_view_with_a_cached_token(self):
+        self.user.first_name = "First"
+        self.user.save()
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        client.get(reverse("user:manage"))
+
+        with self.assertNumQueries(0):
+            response = client.get(reverse("user:manage"))
+
+        self.assertEqual(response.data["first_name"], "First")
+        self.assertEqual(response.data["email"], self.user.email)
+
+    def test_stateless_mode_skips_the_user_lookup_for_safe_methods(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="testpass"
+        )
+        response = APIClient().post(
+            reverse("user:token_obtain_pair"),
+            {"email": "admin@test.com", "password": "testpass"},
+        )
+        header = f"Bearer {response.data['access']}"
+
+        with self.assertNumQueries(0):
+            user = self.authenticate(
+                self.factory.get("/", HTTP_AUTHORIZATION=header),
+                StatelessJWTAuthentication,
+            )
+        self.assertIsInstance(user, TokenUser)
+        self.assertTrue(user.is_staff)
+
+        user = self.authenticate(
+            self.factory.post("/", HTTP_AUTHORIZATION=header),
+            StatelessJWTAuthentication,
+        )
+        self.assertEqual(user, admin)
+
+    def test_stateless_mode_loads_the_user_for_staff_only_actions(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="testpass"
+        )
+        response = APIClient().post(
+            reverse("user:token_obtain_pair"),
+            {"email": "admin@test.com", "password": "testpass"},
+        )
+        client = APIClient(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access']}"
+        )
+        admin.is_staff = False
+        admin.save()
+
+        response = client.get(reverse("airport:flight-export"))
+
+        self.assertEqual(response.status_code, 403)